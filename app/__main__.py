@@ -0,0 +1,162 @@
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+logger = logging.getLogger("app.serve")
+
+# Worker yang mati lebih cepat dari ini dianggap crash loop, respawn ditunda
+MIN_WORKER_UPTIME = 1.0
+
+
+def detect_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def detect_http() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def run_worker(config, sock) -> None:
+    import uvicorn
+
+    # Signal handler parent tidak boleh ikut ke worker, uvicorn pasang sendiri
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Koneksi Prisma/asyncpg dibuka di lifespan, jadi per worker setelah fork
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(config, sock) -> int:
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            run_worker(config, sock)
+        except BaseException:
+            logger.exception("Worker crashed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    return pid
+
+
+def serve_prefork(config, workers: int) -> None:
+    from app.internal.config.settings import settings
+    from app.internal.util.metrics import clear_snapshots
+    from app.internal.util.warmup import prebuild_models
+
+    # Tanpa direktori snapshot bersama, /metrics hanya berisi angka worker yang
+    # kebetulan menerima scrape. Diset sebelum fork supaya semua worker mewarisinya.
+    owned_metrics_dir = None
+    if not settings.METRICS_MULTIPROC_DIR:
+        owned_metrics_dir = tempfile.mkdtemp(prefix="payroll-metrics-")
+        settings.METRICS_MULTIPROC_DIR = owned_metrics_dir
+        os.environ["METRICS_MULTIPROC_DIR"] = owned_metrics_dir
+
+    # Preload app di parent, worker berbagi code page secara copy-on-write.
+    # Schema pydantic dan OpenAPI juga dibangun sekali di sini.
+    config.load()
+    prebuild_models()
+    from app.main import app as application
+    application.openapi()
+    sock = config.bind_socket()
+    # Snapshot metric dari run sebelumnya tidak boleh ikut dijumlah
+    clear_snapshots()
+
+    # Object hasil import dipindah ke generasi permanen supaya GC di worker
+    # tidak menyentuh (dan menyalin) page-nya
+    gc.collect()
+    gc.freeze()
+
+    children = {}
+    stopping = False
+
+    def handle_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, handle_stop)
+    signal.signal(signal.SIGTERM, handle_stop)
+
+    for _ in range(workers):
+        children[spawn_worker(config, sock)] = time.monotonic()
+    logger.info("Started %d workers on %s:%d", workers, config.host, config.port)
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+
+        started_at = children.pop(pid, None)
+        if stopping or started_at is None:
+            continue
+
+        logger.warning("Worker %d exited, respawning", pid)
+        if time.monotonic() - started_at < MIN_WORKER_UPTIME:
+            time.sleep(MIN_WORKER_UPTIME)
+        children[spawn_worker(config, sock)] = time.monotonic()
+
+    sock.close()
+    if owned_metrics_dir:
+        shutil.rmtree(owned_metrics_dir, ignore_errors=True)
+
+
+def serve(args) -> None:
+    import uvicorn
+    from app.internal.config.settings import settings
+    from app.internal.util.log import configure_logging
+
+    # Log uvicorn ikut lewat handler queue di root logger
+    configure_logging()
+    workers = args.workers or settings.WEB_CONCURRENCY or os.cpu_count() or 1
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host or settings.SERVER_HOST,
+        port=args.port or settings.SERVER_PORT,
+        loop=detect_loop(),
+        http=detect_http(),
+        log_level=args.log_level,
+        log_config=None,
+        proxy_headers=True,
+        lifespan="on",
+    )
+
+    # fork tidak tersedia di Windows, jalan single process saja
+    if workers == 1 or not hasattr(os, "fork"):
+        uvicorn.Server(config).run()
+        return
+
+    serve_prefork(config, workers)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the production server")
+    serve_parser.add_argument("--host", default=None)
+    serve_parser.add_argument("--port", type=int, default=None)
+    serve_parser.add_argument("--workers", type=int, default=None, help="Defaults to CPU count")
+    serve_parser.add_argument("--log-level", default="info")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Dict
 from pydantic import BaseModel, Field
 
 
@@ -18,6 +18,7 @@ class Employee(BaseModel):
     bank_name: Optional[str] = None
     is_active: Optional[bool] = True
     photo_url: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
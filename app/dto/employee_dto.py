@@ -1,6 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Dict, List
+from uuid import UUID
 from enum import Enum
 from pydantic import BaseModel, Field, EmailStr, validator
 
@@ -51,6 +52,8 @@ class UpdateEmployeeDto(BaseModel):
     bank_name: Optional[str] = Field(None, max_length=50)
     is_active: Optional[bool] = None
     photo_url: Optional[str] = Field(None, max_length=235)
+    photo_variants: Optional[Dict[str, str]] = None
+    photo_digest: Optional[str] = Field(None, max_length=64)
 
     @validator('full_name')
     def validate_full_name(cls, v):
@@ -78,9 +81,13 @@ class EmployeeResponseDto(BaseModel):
     status: EmployeeStatusDto
     is_active: bool
     photo_url: Optional[str]
+    photo_variants: Optional[Dict[str, str]] = None
     created_at: datetime
     updated_at: datetime
 
+    class Config:
+        from_attributes = True
+
 class EmployeeListResponseDto(BaseModel):
     employee_id: str
     employee_code: str
@@ -90,6 +97,7 @@ class EmployeeListResponseDto(BaseModel):
     status: EmployeeStatusDto
     is_active: bool
     basic_salary: Decimal
+    photo_variants: Optional[Dict[str, str]] = None
 
     class Config:
         from_attributes = True 
@@ -109,4 +117,23 @@ class EmployeeQueryDto(BaseModel):
     class Config: 
         json_encoders = {
             datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+        }
+
+
+# Batas jumlah id per request POST /api/employee/batch (satu query IN)
+EMPLOYEE_BATCH_MAX_IDS = 500
+
+
+class EmployeeBatchRequestDto(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=EMPLOYEE_BATCH_MAX_IDS)
+    # None = semua field EmployeeResponseDto; employee_id selalu ikut
+    fields: Optional[List[str]] = Field(None, min_length=1)
+
+    @validator('fields')
+    def validate_fields(cls, v):
+        if v is None:
+            return v
+        unknown = sorted(set(v) - set(EmployeeResponseDto.model_fields))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return ["employee_id", *dict.fromkeys(field for field in v if field != "employee_id")]
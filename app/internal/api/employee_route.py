@@ -1,33 +1,34 @@
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Form, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Form, File, UploadFile, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 
-from app.internal.connection.prisma import get_db
 from app.internal.repository.employee_repo import EmployeeRepository
-from app.internal.service.cloudinary_service import CloudinaryService
+from app.internal.service.cloudinary_service import get_cloudinary_service
 from app.internal.service.employee_service import EmployeeService
 from app.internal.util.rbac import require_permission
 from app.internal.util.response import success_response, error_response
+from app.internal.util.event_bus import event_bus, format_sse
+from app.internal.util.etag import collection_version, employee_etag, is_not_modified, make_etag, not_modified, set_etag
+from app.internal.config.settings import settings
 from app.dto.employee_dto import (
     CreateEmployeeDto, 
     UpdateEmployeeDto, 
     EmployeeResponseDto, 
     EmployeeListResponseDto,
-    EmployeeQueryDto
+    EmployeeQueryDto,
+    EmployeeBatchRequestDto
 )
-from app.internal.util.dependency import get_current_user
+from app.internal.util.dependency import get_current_user, get_employee_repository
 from app.domain.user_model import User
-from prisma import Prisma
 from datetime import datetime
 from decimal import Decimal
 
 router = APIRouter(prefix="/api/employee", tags=["Employee"])
 security = HTTPBearer()
 
-def get_employee_service(db: Prisma = Depends(get_db)) -> EmployeeService:
-    employee_repo = EmployeeRepository(db)
-    cloudinary_service = CloudinaryService()
-    return EmployeeService(employee_repo)
+def get_employee_service(employee_repo: EmployeeRepository = Depends(get_employee_repository)) -> EmployeeService:
+    return EmployeeService(employee_repo, get_cloudinary_service())
 
 # Create Employee
 @router.post(
@@ -122,6 +123,8 @@ async def create_employee(
 )
 @require_permission(["hrd", "finance"])
 async def get_employees(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     search: str = Query(None),
@@ -143,7 +146,14 @@ async def get_employees(
             sort_order=sort_order
         )
 
-        result = await employee_service.get_employees(query)
+        version = await collection_version()
+        etag = make_etag("employees", version.tag, query.model_dump_json())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        with version.reads():
+            result = await employee_service.get_employees(query)
+        set_etag(response, etag)
         return success_response(
             data = result["data"],
             message="Employees fetched successfully"
@@ -164,17 +174,28 @@ async def get_employees(
 )
 @require_permission(["hrd", "finance"])
 async def search_employees(
+    request: Request,
+    response: Response,
     q: str = Query(..., min_length=1, description="Search term"),
     limit: int = Query(10, ge=1, le=50, description="Max results"),
     current_user: User = Depends(get_current_user),
     employee_service: EmployeeService = Depends(get_employee_service)
 ):
     try:
-        employees = await employee_service.search_employees(q, limit)
+        version = await collection_version()
+        etag = make_etag("search", version.tag, q, limit)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        with version.reads():
+            employees = await employee_service.search_employees(q, limit)
+        set_etag(response, etag)
         return success_response(
             data = [emp.model_dump() for emp in employees],
             message=f"Found {len(employees)} employees"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         return error_response(
             message="Search failed",
@@ -189,22 +210,62 @@ async def search_employees(
 )
 @require_permission(["hrd", "finance"])
 async def get_departments(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     employee_service: EmployeeService = Depends(get_employee_service)
 ):
     
     try:
-        departments = await employee_service.get_departments()
+        version = await collection_version()
+        etag = make_etag("departments", version.tag)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        with version.reads():
+            departments = await employee_service.get_departments()
+        set_etag(response, etag)
         return success_response(
             data=departments,
             message="Departments fetched successfully"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         return error_response(
             message="Failed to fetch departments",
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     
+@router.post(
+    "/batch",
+    response_model=Dict[str, Any],
+    summary="Get employees by ID list",
+    description="Get up to 500 employees in one request, optionally only the requested fields. Requires HR or Finance role"
+)
+@require_permission(["hrd", "finance"])
+async def get_employees_batch(
+    payload: EmployeeBatchRequestDto,
+    current_user: User = Depends(get_current_user),
+    employee_service: EmployeeService = Depends(get_employee_service)
+):
+    try:
+        result = await employee_service.get_employees_batch(
+            [str(employee_id) for employee_id in payload.ids],
+            payload.fields
+        )
+        return success_response(
+            data=result,
+            message=f"Found {len(result['data'])} of {len(payload.ids)} employees"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        return error_response(
+            message="Failed to fetch employees",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 # Update Employee
 @router.patch(
     "/{employee_id}",
@@ -305,21 +366,107 @@ async def update_employee(
 )
 @require_permission(["hrd", "finance"])
 async def get_employee_statistics(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     employee_service: EmployeeService = Depends(get_employee_service)
 ):
     try:
-        stats = await employee_service.get_employee_statistics()
+        version = await collection_version()
+        etag = make_etag("statistics", version.tag)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        with version.reads():
+            stats = await employee_service.get_employee_statistics()
+        set_etag(response, etag)
         return success_response(
             data=stats,
             message="Employee statistics fetched successfully"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         return error_response(
             message="Failed to fetch employee statistics",
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     
+@router.get(
+    "/changes",
+    response_model=Dict[str, Any],
+    summary="Get employee changes since a sync token",
+    description="Delta sync: employees created, updated or deactivated and ids hard-deleted since `since`. "
+                "Omit `since` for the initial sync, then pass `next_token` until `has_more` is false"
+)
+@require_permission(["hrd", "finance"])
+async def get_employee_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous sync"),
+    limit: int = Query(500, ge=1, le=1000, description="Max rows per stream"),
+    current_user: User = Depends(get_current_user),
+    employee_service: EmployeeService = Depends(get_employee_service)
+):
+    try:
+        result = await employee_service.get_changes(since, limit)
+        return success_response(
+            data=result,
+            message=f"{len(result['changes'])} changed, {len(result['deleted'])} deleted"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        return error_response(
+            message="Failed to fetch employee changes",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@router.get(
+    "/events",
+    summary="Stream employee changes",
+    description="Server-sent events: employee.created/updated/deleted with statistics_delta, "
+                "a statistics snapshot on connect, and resync when events were dropped"
+)
+@require_permission(["hrd", "finance"])
+async def stream_employee_events(
+    current_user: User = Depends(get_current_user),
+    employee_service: EmployeeService = Depends(get_employee_service)
+):
+    # Subscribe dulu sebelum ambil snapshot supaya tidak ada event yang terlewat
+    subscription = event_bus.subscribe()
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many event stream connections",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+    try:
+        stats = await employee_service.get_employee_statistics()
+    except BaseException:
+        event_bus.unsubscribe(subscription)
+        raise
+
+    async def stream():
+        try:
+            yield format_sse("statistics", stats)
+            while True:
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield format_sse("resync", {})
+                event = await subscription.next(settings.SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    # Komentar SSE, menjaga koneksi tetap hidup lewat proxy
+                    yield ": heartbeat\n\n"
+                    continue
+                yield format_sse(event["type"], event)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get(
     "/me",
     response_model=Dict[str, Any],
@@ -328,6 +475,8 @@ async def get_employee_statistics(
 )
 @require_permission(["employee"])
 async def get_my_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     employee_service: EmployeeService = Depends(get_employee_service)
 ):
@@ -338,7 +487,13 @@ async def get_my_profile(
                 detail="Employee profile not found"
             )
         
+        # Dari cache kalau ada: 304 tanpa query DB
         employee = await employee_service.get_employee_by_id(current_user.employee_id)
+        etag = employee_etag(employee.employee_id, employee.updated_at.isoformat())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        set_etag(response, etag)
         return success_response(
             data= employee.model_dump(),
             message= "Profile fetched successfully"
@@ -360,12 +515,19 @@ async def get_my_profile(
 )
 @require_permission(["hrd", "finance"])
 async def get_employee_by_id(
+    request: Request,
+    response: Response,
     employee_id: str,
     current_user: User = Depends(get_current_user),
     employee_service: EmployeeService = Depends(get_employee_service)
 ):
     try:
         employee = await employee_service.get_employee_by_id(employee_id)
+        etag = employee_etag(employee.employee_id, employee.updated_at.isoformat())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        set_etag(response, etag)
         return success_response(
             data= employee.model_dump(),
             message= "Employee fetched successfully"
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("")
+async def liveness():
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness(request: Request):
+    # Not ready sampai warm-up selesai, load balancer belum kirim traffic
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting"}
+        )
+    return {"status": "ready"}
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.internal.util.metrics import registry, render_latest
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    # Baca + gabung snapshot semua worker dari disk, jangan di event loop
+    content = await run_in_threadpool(render_latest, registry.snapshot())
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import os
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 load_dotenv()
@@ -9,6 +10,165 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    DEBUG: bool = False
+
+    # Logging lewat queue (non-blocking). LOG_SAMPLE_RATES: prefix logger -> rate
+    # untuk DEBUG/INFO, mis. {"app.internal.repository": 0.01}
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = False
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+    LOG_QUEUE_SIZE: int = 10000
+
+    # Server (python -m app serve)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: Optional[int] = None
+
+    # "prisma" (default) atau "memory": repository in-memory berisi data sintetis,
+    # untuk benchmark stack HTTP/serialisasi tanpa Postgres
+    REPOSITORY_BACKEND: str = "prisma"
+    MEMORY_SEED_EMPLOYEES: int = 1000
+    # Sama dengan DEFAULT_PASSWORD load test (benchmarks/loadtest/dataset.py)
+    MEMORY_SEED_PASSWORD: str = "loadtest123"
+
+    # Database pool (None = pakai default Prisma engine)
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # Perkiraan lag replica terburuk: selama ini setelah write, data yang diberi
+    # ETag versi koleksi baru dibaca dari primary
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_POOL_SIZE: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[int] = None
+    DB_CONNECT_TIMEOUT: Optional[int] = None
+
+    # Budget per request, lewat dari ini di-log sebagai warning (N+1, round trip serial)
+    DB_QUERY_COUNT_BUDGET: int = 10
+    DB_TIME_BUDGET_MS: float = 200.0
+
+    # Metrics Prometheus, agregasi antar worker lewat file snapshot per pid
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 5.0
+
+    # Monitor event loop. Watchdog blocking call (dump stack) hanya aktif saat DEBUG
+    LOOP_LAG_SAMPLE_INTERVAL_SECONDS: float = 0.5
+    LOOP_BLOCK_THRESHOLD_MS: float = 100.0
+
+    # Thread pool khusus bcrypt supaya verifikasi password tidak blocking event loop
+    BCRYPT_POOL_SIZE: int = 4
+
+    # asyncpg fast path untuk read yang paling sering dipanggil
+    ASYNCPG_ENABLED: bool = False
+    ASYNCPG_POOL_MIN_SIZE: int = 1
+    ASYNCPG_POOL_MAX_SIZE: int = 10
+    ASYNCPG_STATEMENT_CACHE_SIZE: int = 256
+    ASYNCPG_FAST_METHODS: List[str] = [
+        "get_user_by_username",
+        "get_user_by_email",
+        "get_user_by_id",
+        "get_users_by_ids",
+        "find_by_id",
+        "find_many_by_ids",
+        "find_all",
+        "get_departments",
+    ]
+
+    # Kompresi response (gzip, brotli/zstd kalau package-nya terpasang)
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_THREAD_THRESHOLD: int = 64 * 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_SIZE: int = 64
+    COMPRESSION_CACHEABLE_PATHS: List[str] = [
+        "/api/employee/departments",
+        "/api/employee/statistics",
+    ]
+
+    # Cache data referensi (departments, statistik)
+    REFERENCE_CACHE_TTL_SECONDS: int = 30
+
+    # Cache dua tingkat: L1 LRU per proses, L2 Redis (kalau di-set) atau lokal.
+    # Invalidasi antar worker lewat LISTEN/NOTIFY di channel ini ("" = mati)
+    CACHE_L1_MAX_ENTRIES: int = 10000
+    CACHE_L1_TTL_SECONDS: float = 30.0
+    CACHE_L2_TTL_SECONDS: float = 300.0
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_KEY_PREFIX: str = "payroll:"
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+    # Batas umur data basi yang masih boleh disajikan setelah TTL habis
+    # (stale-while-revalidate / saat DB down)
+    CACHE_MAX_STALE_SECONDS: float = 600.0
+
+    # Admission control per kelas prioritas. Key ADMISSION_ROUTE_CLASSES (juga
+    # DB_DEADLINES_MS): "METHOD /path" atau "/path" (exact), diakhiri "/" berarti prefix.
+    # Kelas yang tidak ada di ADMISSION_LIMITS tidak dibatasi.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_ROUTE_CLASSES: Dict[str, str] = {
+        "/api/auth/": "auth",
+        "/api/employee/me": "self_service",
+        "/api/employee/events": "stream",
+        "GET /api/employee": "heavy",
+        "/api/employee/search": "heavy",
+        "/health": "internal",
+        "/health/": "internal",
+        "/metrics": "internal",
+    }
+    ADMISSION_LIMITS: Dict[str, int] = {
+        "auth": 16,
+        "self_service": 32,
+        "default": 32,
+        "heavy": 4,
+    }
+    ADMISSION_QUEUE_SIZES: Dict[str, int] = {
+        "auth": 64,
+        "self_service": 64,
+        "default": 64,
+        "heavy": 8,
+    }
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Deadline DB per request (ms), dihitung dari awal request. Query baca yang
+    # melewatinya dibatalkan dan request dijawab 504. 0 = tanpa deadline
+    DB_DEADLINE_DEFAULT_MS: float = 5000.0
+    DB_DEADLINES_MS: Dict[str, float] = {
+        "/api/auth/": 2000.0,
+        "/api/employee/me": 2000.0,
+        "GET /api/employee": 8000.0,
+        "/api/employee/search": 3000.0,
+        "/health": 0.0,
+        "/health/": 0.0,
+        "/metrics": 0.0,
+    }
+    # Read Prisma yang dibatasi deadline dijalankan di transaksi pendek dengan
+    # SET LOCAL statement_timeout = sisa deadline, supaya query berhenti juga di
+    # server (wait_for saja hanya melepas caller). Biaya: BEGIN/SET/COMMIT per read.
+    # Read asyncpg tidak butuh ini: timeout= asyncpg mengirim cancel ke server.
+    DB_SCOPED_STATEMENT_TIMEOUT: bool = True
+
+    # Delta sync: perubahan yang lebih baru dari (sekarang - lag) ditunda ke sync
+    # berikutnya, memberi waktu transaksi yang updated_at-nya sudah di-set untuk commit
+    DELTA_SYNC_SAFETY_LAG_SECONDS: float = 5.0
+
+    # SSE /api/employee/events: event bus per worker, antar worker lewat NOTIFY
+    # di EVENT_BUS_CHANNEL ("" = hanya lokal). Kelas admission "stream" tidak
+    # dibatasi, jumlah koneksi dibatasi SSE_MAX_SUBSCRIBERS per worker.
+    EVENT_BUS_CHANNEL: str = "employee_events"
+    SSE_QUEUE_SIZE: int = 100
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_MAX_SUBSCRIBERS: int = 1000
+
+    # Maksimal key per query IN dari Batcher (DataLoader)
+    DATALOADER_MAX_BATCH_SIZE: int = 500
+
+    # Photo processing
+    CLOUDINARY_FOLDER: str = "intern"
+    PHOTO_VARIANT_SIZES: List[int] = [64, 160, 400]
+    PHOTO_WEBP_QUALITY: int = 80
+    IMAGE_PROCESS_WORKERS: int = 2
+    # Batas menunggu lock per digest foto, dan batas waktu klaim (cek dedup +
+    # update employee) selama lock dipegang. Upload Cloudinary di luar lock.
+    PHOTO_LOCK_TIMEOUT_SECONDS: float = 5.0
+    PHOTO_CLAIM_TIMEOUT_SECONDS: float = 5.0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,90 @@
+import json
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from app.internal.config.settings import settings
+
+# Parameter URL khusus Prisma, tidak dikenal libpq/asyncpg
+PRISMA_ONLY_PARAMS = {
+    "schema",
+    "connection_limit",
+    "pool_timeout",
+    "pgbouncer",
+    "statement_cache_size",
+    "socket_timeout",
+}
+
+pg_pool = None
+pg_replica_pool = None
+
+
+def to_asyncpg_dsn(url: str) -> str:
+    parts = urlsplit(url)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query)
+        if key not in PRISMA_ONLY_PARAMS
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+async def _init_connection(conn):
+    # uuid langsung jadi str dan jsonb jadi dict, sama seperti model Prisma
+    await conn.set_type_codec(
+        "uuid", encoder=str, decoder=str, schema="pg_catalog", format="text"
+    )
+    await conn.set_type_codec(
+        "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+    )
+
+
+def _load_asyncpg():
+    # asyncpg opsional dan baru di-import kalau fast path diaktifkan
+    try:
+        import asyncpg
+    except ImportError:
+        return None
+    return asyncpg
+
+
+async def _create_pool(asyncpg, url: str):
+    return await asyncpg.create_pool(
+        to_asyncpg_dsn(url),
+        min_size=settings.ASYNCPG_POOL_MIN_SIZE,
+        max_size=settings.ASYNCPG_POOL_MAX_SIZE,
+        # Statement yang sering dipakai disimpan sebagai prepared statement per koneksi
+        statement_cache_size=settings.ASYNCPG_STATEMENT_CACHE_SIZE,
+        timeout=settings.DB_CONNECT_TIMEOUT or 60,
+        init=_init_connection,
+    )
+
+
+async def connect_pg():
+    global pg_pool, pg_replica_pool
+    if not settings.ASYNCPG_ENABLED:
+        return None
+    asyncpg = _load_asyncpg()
+    if asyncpg is None:
+        return None
+    if pg_pool is None:
+        pg_pool = await _create_pool(asyncpg, settings.DATABASE_URL)
+    if settings.DATABASE_REPLICA_URL and pg_replica_pool is None:
+        pg_replica_pool = await _create_pool(asyncpg, settings.DATABASE_REPLICA_URL)
+    return pg_pool
+
+
+async def disconnect_pg():
+    global pg_pool, pg_replica_pool
+    for pool in (pg_replica_pool, pg_pool):
+        if pool is not None:
+            await pool.close()
+    pg_pool = None
+    pg_replica_pool = None
+
+
+def get_pg_pool(replica: bool = False):
+    if replica and pg_replica_pool is not None:
+        return pg_replica_pool
+    return pg_pool
+
+
+def use_fast_path(method: str) -> bool:
+    return pg_pool is not None and method in settings.ASYNCPG_FAST_METHODS
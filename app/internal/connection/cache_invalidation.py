@@ -0,0 +1,50 @@
+import json
+import logging
+from typing import Iterable
+from app.internal.config.settings import settings
+from app.internal.connection import pg_listener
+from app.internal.util.cache import shared_cache
+from app.internal.util.metrics import CACHE_INVALIDATIONS
+
+logger = logging.getLogger(__name__)
+
+# Payload NOTIFY Postgres maksimal 8000 byte, key dikirim per batch
+MAX_KEYS_PER_NOTIFY = 100
+
+
+async def invalidate(client, *keys: str) -> None:
+    # Dipanggil repository setelah write: hapus L1 + L2 sendiri, lalu kabari worker lain.
+    # `client` adalah client Prisma writer; memory backend mengirim None.
+    keys = tuple(dict.fromkeys(keys))
+    if not keys:
+        return
+    await shared_cache.invalidate(*keys)
+    CACHE_INVALIDATIONS.inc(len(keys), source="local")
+    if client is None or not settings.CACHE_INVALIDATION_CHANNEL:
+        return
+    try:
+        for start in range(0, len(keys), MAX_KEYS_PER_NOTIFY):
+            payload = json.dumps({"origin": pg_listener.instance_id(), "keys": keys[start:start + MAX_KEYS_PER_NOTIFY]})
+            await client.execute_raw("SELECT pg_notify($1, $2)", settings.CACHE_INVALIDATION_CHANNEL, payload)
+    except Exception:
+        # Write sudah commit; worker lain tetap konsisten setelah TTL L1 habis
+        logger.exception("Failed to broadcast cache invalidation for %d keys", len(keys))
+
+
+async def _apply_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed cache invalidation payload")
+        return
+    if message.get("origin") == pg_listener.instance_id():
+        return
+    keys: Iterable[str] = message.get("keys") or ()
+    await shared_cache.invalidate_local(*keys)
+    CACHE_INVALIDATIONS.inc(len(message.get("keys") or ()), source="notify")
+
+
+def register_invalidation_listener() -> None:
+    # L1 dibersihkan total setiap (re)connect: NOTIFY selama putus hilang
+    if settings.CACHE_INVALIDATION_CHANNEL:
+        pg_listener.register(settings.CACHE_INVALIDATION_CHANNEL, _apply_notification, shared_cache.clear_local)
@@ -0,0 +1,159 @@
+import asyncio
+import inspect
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import wraps
+from typing import Any, Dict
+from prisma import Prisma
+from app.internal.config.settings import settings
+from app.internal.util.deadline import DeadlineExceeded, remaining_time
+from app.internal.util.metrics import DB_DEADLINE_EXCEEDED, DB_QUERY_DURATION
+from app.internal.util.request_context import QueryRecord, get_request_context
+
+RAW_ACTIONS = {"query_raw", "query_first", "execute_raw"}
+
+# Hanya read yang dibatalkan saat deadline lewat. Write yang dibatalkan di sisi
+# client bisa tetap commit di query engine, hasilnya jadi ambigu bagi caller.
+READ_ACTIONS = {
+    "find_unique",
+    "find_unique_or_raise",
+    "find_first",
+    "find_first_or_raise",
+    "find_many",
+    "count",
+    "group_by",
+    "query_raw",
+    "query_first",
+}
+
+
+def record_query(model: str, action: str, duration: float) -> None:
+    DB_QUERY_DURATION.observe(duration, model=model, action=action)
+    context = get_request_context()
+    if context is not None:
+        context.queries.append(QueryRecord(model, action, duration))
+
+
+@contextmanager
+def query_timer(model: str, action: str):
+    # Untuk query di luar Prisma (asyncpg fast path)
+    start = time.perf_counter()
+    try:
+        yield
+    except asyncio.TimeoutError:
+        # timeout= asyncpg sudah membatalkan query di server
+        DB_DEADLINE_EXCEEDED.inc(model=model, action=action)
+        raise DeadlineExceeded()
+    finally:
+        record_query(model, action, time.perf_counter() - start)
+
+
+# Transaksi pembungkus read boleh hidup sedikit lebih lama dari statement_timeout,
+# supaya yang menghentikan query adalah server (error timeout), bukan query engine
+SCOPED_TX_GRACE_SECONDS = 1.0
+
+
+async def _run_scoped(client: Prisma, model: str, action: str, timeout: float, args, kwargs):
+    # statement_timeout hanya berlaku di transaksi ini (SET LOCAL), koneksi
+    # pool lain dan write tidak terpengaruh
+    timeout_ms = str(max(int(timeout * 1000), 1))
+    tx_timeout = timedelta(seconds=timeout + SCOPED_TX_GRACE_SECONDS)
+    async with client.tx(max_wait=tx_timeout, timeout=tx_timeout) as transaction:
+        await transaction.execute_raw("SELECT set_config('statement_timeout', $1, true)", timeout_ms)
+        target = transaction if model == "raw" else getattr(transaction, model)
+        return await getattr(target, action)(*args, **kwargs)
+
+
+def _deadline_passed() -> bool:
+    try:
+        remaining_time()
+    except DeadlineExceeded:
+        return True
+    return False
+
+
+def _timed(func, model: str, action: str, client: Prisma):
+    bounded = action in READ_ACTIONS
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            timeout = remaining_time() if bounded else None
+            if timeout is None:
+                return await func(*args, **kwargs)
+            if not settings.DB_SCOPED_STATEMENT_TIMEOUT:
+                # Hanya melepas caller, query di server tetap jalan sampai selesai
+                return await asyncio.wait_for(func(*args, **kwargs), timeout)
+            # Server menghentikan query lewat statement_timeout; wait_for cadangan
+            # kalau query engine sendiri tidak menjawab
+            return await asyncio.wait_for(
+                _run_scoped(client, model, action, timeout, args, kwargs),
+                timeout + SCOPED_TX_GRACE_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            DB_DEADLINE_EXCEEDED.inc(model=model, action=action)
+            raise DeadlineExceeded()
+        except Exception:
+            # Error "canceling statement due to statement timeout" dari server
+            if bounded and _deadline_passed():
+                DB_DEADLINE_EXCEEDED.inc(model=model, action=action)
+                raise DeadlineExceeded()
+            raise
+        finally:
+            record_query(model, action, time.perf_counter() - start)
+    return wrapper
+
+
+class InstrumentedModel:
+    # Proxy untuk db.<model>, tiap action (find_many, count, ...) dicatat
+    def __init__(self, delegate: Any, model: str, client: Prisma):
+        self._delegate = delegate
+        self._model = model
+        self._client = client
+
+    def __getattr__(self, action: str):
+        attr = getattr(self._delegate, action)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+        timed = _timed(attr, self._model, action, self._client)
+        # Cache di instance, __getattr__ berikutnya tidak dipanggil lagi
+        setattr(self, action, timed)
+        return timed
+
+
+class InstrumentedPrisma:
+    # Proxy client Prisma yang mencatat jumlah, durasi, model/action query
+    # ke RequestContext request yang sedang berjalan
+    def __init__(self, client: Prisma):
+        self._client = client
+        self._models: Dict[str, InstrumentedModel] = {}
+
+    @property
+    def client(self) -> Prisma:
+        return self._client
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if name in RAW_ACTIONS:
+            timed = _timed(attr, "raw", name, self._client)
+            setattr(self, name, timed)
+            return timed
+        if type(attr).__name__.endswith("Actions"):
+            model = InstrumentedModel(attr, name, self._client)
+            setattr(self, name, model)
+            return model
+        return attr
+
+
+_instrumented: Dict[int, InstrumentedPrisma] = {}
+
+
+def instrument(client):
+    if client is None or isinstance(client, InstrumentedPrisma):
+        return client
+    wrapper = _instrumented.get(id(client))
+    if wrapper is None:
+        wrapper = _instrumented[id(client)] = InstrumentedPrisma(client)
+    return wrapper
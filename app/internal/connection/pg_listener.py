@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.internal.config.settings import settings
+from app.internal.connection.asyncpg_pool import _load_asyncpg, to_asyncpg_dsn
+
+logger = logging.getLogger(__name__)
+
+# Satu koneksi asyncpg khusus LISTEN per worker, dipakai bersama semua channel
+# (invalidasi cache, event bus). Koneksi yang sama juga dipakai untuk NOTIFY
+# dari kode yang tidak memegang client Prisma.
+
+# Id unik per proses untuk mengenali NOTIFY milik sendiri. Bukan pid: pid
+# berulang antar container (sering 1) dan Postgres mengirim NOTIFY ke semua
+# listener, termasuk pengirimnya. Dibuat ulang di child setelah fork.
+_instance_id = uuid.uuid4().hex
+
+
+def _regenerate_instance_id() -> None:
+    global _instance_id
+    _instance_id = uuid.uuid4().hex
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_regenerate_instance_id)
+
+
+def instance_id() -> str:
+    return _instance_id
+
+
+Handler = Callable[[str], Awaitable[None]]
+ReconnectHook = Callable[[], Awaitable[None]]
+
+handlers: Dict[str, Handler] = {}
+reconnect_hooks: List[ReconnectHook] = []
+
+listener_task: Optional[asyncio.Task] = None
+connection = None
+_notify_lock = asyncio.Lock()
+
+
+def register(channel: str, handler: Handler, on_reconnect: Optional[ReconnectHook] = None) -> None:
+    # Dipanggil sebelum start_listener. on_reconnect: notifikasi selama koneksi
+    # putus hilang, pemilik channel harus menganggap state lokalnya basi.
+    handlers[channel] = handler
+    if on_reconnect is not None:
+        reconnect_hooks.append(on_reconnect)
+
+
+async def notify(channel: str, payload: str) -> bool:
+    # False kalau listener belum/tidak terhubung (worker lain tidak dikabari)
+    if connection is None or connection.is_closed():
+        return False
+    try:
+        # Satu koneksi asyncpg tidak boleh menjalankan dua query bersamaan
+        async with _notify_lock:
+            await connection.execute("SELECT pg_notify($1, $2)", channel, payload)
+        return True
+    except Exception:
+        logger.exception("Failed to NOTIFY on %s", channel)
+        return False
+
+
+def _dispatch(channel: str, payload: str) -> None:
+    handler = handlers.get(channel)
+    if handler is not None:
+        asyncio.ensure_future(handler(payload))
+
+
+async def _listen(asyncpg) -> None:
+    global connection
+    backoff = 1.0
+    while True:
+        try:
+            connection = await asyncpg.connect(to_asyncpg_dsn(settings.DATABASE_URL))
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            for channel in handlers:
+                await connection.add_listener(
+                    channel,
+                    lambda _conn, _pid, channel, payload: _dispatch(channel, payload),
+                )
+            for hook in reconnect_hooks:
+                await hook()
+            logger.info("Listening on %s", ", ".join(handlers))
+            backoff = 1.0
+            await lost.wait()
+            logger.warning("LISTEN connection lost, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("LISTEN connection failed, retrying in %.0fs", backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+            connection = None
+
+
+async def start_listener() -> None:
+    global listener_task
+    if not handlers or listener_task is not None:
+        return
+    asyncpg = _load_asyncpg()
+    if asyncpg is None:
+        logger.warning("asyncpg is not installed, cross-worker notifications are disabled")
+        return
+    listener_task = asyncio.create_task(_listen(asyncpg))
+
+
+async def stop_listener() -> None:
+    global listener_task
+    if listener_task is None:
+        return
+    listener_task.cancel()
+    try:
+        await listener_task
+    except asyncio.CancelledError:
+        pass
+    listener_task = None
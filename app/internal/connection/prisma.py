@@ -1,18 +1,99 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from fastapi import Depends, HTTPException, status
 from prisma import Prisma
+from app.internal.config.settings import settings
+from app.internal.connection.instrumentation import instrument
 
-prisma = Prisma()
+
+def build_datasource_url(url: str) -> str:
+    # Pool Prisma engine diatur lewat query string di connection URL
+    pool_params = {
+        "connection_limit": settings.DB_POOL_SIZE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "connect_timeout": settings.DB_CONNECT_TIMEOUT,
+    }
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    for key, value in pool_params.items():
+        if value is not None:
+            query[key] = str(value)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+prisma = Prisma(datasource={"url": build_datasource_url(settings.DATABASE_URL)})
+
+replica: Optional[Prisma] = None
+if settings.DATABASE_REPLICA_URL:
+    replica = Prisma(datasource={"url": build_datasource_url(settings.DATABASE_REPLICA_URL)})
 
 db = prisma
+
+# Aktif selama mengisi cache: baris basi dari replica (lag) yang masuk cache
+# tepat setelah invalidasi akan bertahan sampai TTL habis
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads():
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class DbSession:
+    # Satu instance per request: read ke replica, write ke primary.
+    # Setelah ada write, read berikutnya di request yang sama ikut ke primary
+    # supaya hasil write sendiri langsung kelihatan (read-your-writes).
+    # Cek konsistensi sebelum write (unique code/email) pakai .primary
+    # langsung tanpa mengaktifkan sticky.
+    def __init__(self, primary: Prisma, replica: Optional[Prisma] = None):
+        # Semua query lewat session tercatat di RequestContext (Server-Timing)
+        self.primary = instrument(primary)
+        self.replica = instrument(replica)
+        self.sticky = False
+
+    @property
+    def prefers_replica(self) -> bool:
+        return not self.sticky and not _primary_reads.get()
+
+    @property
+    def reader(self) -> Prisma:
+        if not self.prefers_replica or self.replica is None or not self.replica.is_connected():
+            return self.primary
+        return self.replica
+
+    @property
+    def writer(self) -> Prisma:
+        self.sticky = True
+        return self.primary
+
+
 async def connect_db():
     if not prisma.is_connected():
         await prisma.connect()
+    if replica is not None and not replica.is_connected():
+        await replica.connect()
     return prisma
 
 async def disconnect_db():
     if prisma.is_connected():
         await prisma.disconnect()
+    if replica is not None and replica.is_connected():
+        await replica.disconnect()
 
 async def get_db() -> Prisma:
+    # Koneksi dibuka di lifespan, request tidak boleh connect di tengah jalan
     if not prisma.is_connected():
-        await prisma.connect()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is not ready"
+        )
     return prisma
+
+def get_db_session(db: Prisma = Depends(get_db)) -> DbSession:
+    return DbSession(db, replica)
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.internal.config.settings import settings
+from app.internal.util.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED
+from app.internal.util.response import error_response
+from app.internal.util.route_rules import RouteRules
+
+DEFAULT_CLASS = "default"
+
+
+class PriorityClass:
+    # Bulkhead per kelas prioritas: maksimal `limit` request jalan bersamaan,
+    # sisanya antre FIFO sampai `queue_size`. Kelas lain punya slot sendiri,
+    # jadi burst list/search tidak bisa menghabiskan kapasitas auth/self-service.
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> Optional[str]:
+        # None kalau dapat slot, selain itu alasan penolakan
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return None
+        if len(self.waiters) >= self.queue_size:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            return "timeout"
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        return None
+
+    def release(self) -> None:
+        # Slot langsung diserahkan ke waiter berikutnya, `active` tidak berubah
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # Slot sudah diserahkan tepat saat timeout/cancel, kembalikan
+            self.release()
+        else:
+            try:
+                self.waiters.remove(waiter)
+            except ValueError:
+                pass
+
+
+def build_classes() -> Dict[str, PriorityClass]:
+    return {
+        name: PriorityClass(name, limit, settings.ADMISSION_QUEUE_SIZES.get(name, 0))
+        for name, limit in settings.ADMISSION_LIMITS.items()
+    }
+
+
+class AdmissionControlMiddleware:
+    # Pure ASGI. Request dipetakan ke kelas prioritas lewat ADMISSION_ROUTE_CLASSES,
+    # kelas tanpa entry di ADMISSION_LIMITS (health, metrics) tidak dibatasi.
+    # Antrean penuh atau kelamaan menunggu langsung dijawab 503 + Retry-After.
+
+    def __init__(self, app: ASGIApp, route_classes: Optional[Dict[str, str]] = None):
+        self.app = app
+        self.rules = RouteRules(settings.ADMISSION_ROUTE_CLASSES if route_classes is None else route_classes)
+        self.classes = build_classes()
+
+    def classify(self, method: str, path: str) -> str:
+        return self.rules.match(method, path, DEFAULT_CLASS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # OPTIONS (preflight CORS) murah dan tidak boleh ikut antre
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.classify(scope["method"], scope["path"])
+        bulkhead = self.classes.get(priority)
+        if bulkhead is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        rejected = await bulkhead.acquire(settings.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+        ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - start, priority=priority)
+        if rejected:
+            ADMISSION_REJECTED.inc(priority=priority, reason=rejected)
+            response = error_response(
+                message="Server is busy, please retry",
+                error=f"admission_{rejected}",
+                status_code=503,
+            )
+            response.headers["Retry-After"] = str(settings.ADMISSION_RETRY_AFTER_SECONDS)
+            await response(scope, receive, send)
+            return
+
+        ADMISSION_IN_FLIGHT.inc(priority=priority)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ADMISSION_IN_FLIGHT.dec(priority=priority)
+            bulkhead.release()
@@ -10,7 +10,7 @@ class AuthMiddleware:
 
     async def __call__(self, request: Request, call_next):
         # skip buat endpoint publicnya
-        if request.url.path in ["/auth/login", "/docs", "/openapi.json","/health"]:
+        if request.url.path in ["/auth/login", "/docs", "/openapi.json","/health", "/health/ready"]:
             response = await call_next(request)
             return response
         
@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import importlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.internal.config.settings import settings
+from app.internal.util.metrics import CACHE_REQUESTS
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+# Urutan preferensi server kalau client menerima beberapa encoding dengan q sama
+ENCODING_PREFERENCE = ("br", "zstd", "gzip")
+
+
+@lru_cache(maxsize=None)
+def available_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    # brotli/zstandard opsional, gzip selalu ada
+    encoders = {"gzip": lambda body: gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)}
+    try:
+        brotli = importlib.import_module("brotli")
+        encoders["br"] = lambda body: brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    except ImportError:
+        pass
+    try:
+        zstandard = importlib.import_module("zstandard")
+        # ZstdCompressor tidak thread-safe, dibuat per panggilan
+        encoders["zstd"] = lambda body: zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(body)
+    except ImportError:
+        pass
+    return encoders
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    encoders = available_encoders()
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    best = None
+    best_quality = 0.0
+    for encoding in ENCODING_PREFERENCE:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in encoders and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressedCache:
+    # LRU kecil untuk hasil kompresi response yang bisa di-cache (data
+    # referensi), key (ETag atau hash body, encoding)
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        value = self._data.get(key)
+        if value is None:
+            CACHE_REQUESTS.inc(cache="compression", result="miss")
+            return None
+        self._data.move_to_end(key)
+        CACHE_REQUESTS.inc(cache="compression", result="hit")
+        return value
+
+    def set(self, key: Tuple[str, str], value: bytes) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+
+compressed_cache = CompressedCache(settings.COMPRESSION_CACHE_SIZE)
+
+
+class CompressionMiddleware:
+    # Pure ASGI. Hanya response non-streaming yang dikompres (JSONResponse dkk),
+    # response streaming/SSE diteruskan apa adanya.
+
+    def __init__(self, app: ASGIApp, cacheable_paths: Optional[List[str]] = None):
+        self.app = app
+        self.cacheable_paths = frozenset(
+            settings.COMPRESSION_CACHEABLE_PATHS if cacheable_paths is None else cacheable_paths
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._should_compress(start_message, body):
+                # Streaming atau kecil: kirim header asli lalu teruskan sisanya
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = await self._compress(scope, start_message, body, encoding)
+            headers = MutableHeaders(scope=start_message)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # Body berubah byte-nya, ETag kuat tidak lagi valid
+                headers["etag"] = f"W/{etag}"
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, start_message: Message, body: bytes) -> bool:
+        if start_message["status"] in (204, 206, 304) or len(body) < settings.COMPRESSION_MIN_SIZE:
+            return False
+        headers = Headers(raw=start_message["headers"])
+        return "content-encoding" not in headers and is_compressible(headers)
+
+    async def _compress(self, scope: Scope, start_message: Message, body: bytes, encoding: str) -> bytes:
+        cache_key = None
+        if scope["path"] in self.cacheable_paths and start_message["status"] == 200:
+            etag = Headers(raw=start_message["headers"]).get("etag")
+            version = etag or hashlib.blake2b(body, digest_size=16).hexdigest()
+            cache_key = (f"{scope['path']}:{version}", encoding)
+            cached = compressed_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        encoder = available_encoders()[encoding]
+        if len(body) >= settings.COMPRESSION_THREAD_THRESHOLD:
+            # zlib/brotli/zstd melepas GIL, body besar dikompres di thread
+            compressed = await anyio.to_thread.run_sync(encoder, body)
+        else:
+            compressed = encoder(body)
+
+        if cache_key is not None:
+            compressed_cache.set(cache_key, compressed)
+        return compressed
@@ -0,0 +1,56 @@
+import logging
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.internal.config.settings import settings
+from app.internal.util.deadline import deadline_for
+from app.internal.util.request_context import (
+    RequestContext,
+    reset_request_context,
+    set_request_context,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimingMiddleware:
+    # Pure ASGI (bukan BaseHTTPMiddleware) supaya contextvar terlihat di endpoint
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext(deadline=deadline_for(scope["method"], scope["path"]))
+        token = set_request_context(context)
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={context.db_time * 1000:.1f};desc="{context.query_count} queries", '
+                    f"app;dur={context.elapsed * 1000:.1f}"
+                )
+                for warning in context.warnings:
+                    headers.append("Warning", warning)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            reset_request_context(token)
+            self._check_budget(scope, context)
+
+    def _check_budget(self, scope: Scope, context: RequestContext) -> None:
+        db_time_ms = context.db_time * 1000
+        if context.query_count > settings.DB_QUERY_COUNT_BUDGET or db_time_ms > settings.DB_TIME_BUDGET_MS:
+            logger.warning(
+                "DB budget exceeded: %s %s made %d queries in %.1f ms (%s)",
+                scope["method"],
+                scope["path"],
+                context.query_count,
+                db_time_ms,
+                context.query_summary(),
+            )
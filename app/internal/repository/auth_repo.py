@@ -1,96 +1,104 @@
-from typing import Optional
-from datetime import datetime
-from prisma import Prisma
+from typing import List, Optional
+from datetime import datetime, timezone
+from app.internal.connection.prisma import DbSession
+from app.internal.connection.cache_invalidation import invalidate
+from app.internal.util.cache import user_key
+from app.internal.util.deadline import DeadlineExceeded
 from app.domain.user_model import User, UserRole
 import logging
 
 logger = logging.getLogger(__name__)
 
 class AuthRepository:
-    def __init__(self, db: Prisma):
+    def __init__(self, db: DbSession):
         self.db = db
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
         try:
-            logger.debug(f"Searching user by username: {username}")
-            user_data = await self.db.users.find_unique(where={"username": username})
+            logger.debug("Searching user by username: %s", username)
+            user_data = await self.db.reader.users.find_unique(where={"username": username})
             
             if user_data:
-                logger.debug(f"User found by username: {user_data.username}, role: {user_data.role}")
+                logger.debug("User found by username: %s, role: %s", user_data.username, user_data.role)
                 # Convert role string to UserRole enum
                 user_dict = user_data.dict()
                 user_dict['role'] = UserRole(user_dict['role'])
                 user = User(**user_dict)
-                logger.debug(f"User object created successfully for: {user.username}")
+                logger.debug("User object created successfully for: %s", user.username)
                 return user
             else:
-                logger.debug(f"No user found with username: {username}")
+                logger.debug("No user found with username: %s", username)
                 return None
                 
-        except Exception as e:
-            logger.error(f"Error searching user by username {username}: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            logger.exception("Error searching user by username %s", username)
             return None
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         try:
-            logger.debug(f"Searching user by email: {email}")
-            user_data = await self.db.users.find_unique(where={"email": email})
+            logger.debug("Searching user by email: %s", email)
+            user_data = await self.db.reader.users.find_unique(where={"email": email})
             
             if user_data:
-                logger.debug(f"User found by email: {user_data.username}, role: {user_data.role}")
+                logger.debug("User found by email: %s, role: %s", user_data.username, user_data.role)
 
                 user_dict = user_data.dict()
                 user_dict['role'] = UserRole(user_dict['role'])
                 user = User(**user_dict)
-                logger.debug(f"User object created successfully for: {user.username}")
+                logger.debug("User object created successfully for: %s", user.username)
                 return user
             else:
-                logger.debug(f"No user found with email: {email}")
+                logger.debug("No user found with email: %s", email)
                 return None
                 
-        except Exception as e:
-            logger.error(f"Error searching user by email {email}: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            logger.exception("Error searching user by email %s", email)
             return None
 
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         try:
-            logger.debug(f"Searching user by ID: {user_id}")
-            user_data = await self.db.users.find_unique(where={"user_id": user_id})
+            logger.debug("Searching user by ID: %s", user_id)
+            user_data = await self.db.reader.users.find_unique(where={"user_id": user_id})
             
             if user_data:
-                logger.debug(f"User found by ID: {user_data.username}, role: {user_data.role}")
+                logger.debug("User found by ID: %s, role: %s", user_data.username, user_data.role)
 
                 user_dict = user_data.dict()
                 user_dict['role'] = UserRole(user_dict['role'])
                 user = User(**user_dict)
-                logger.debug(f"User object created successfully for: {user.username}")
+                logger.debug("User object created successfully for: %s", user.username)
                 return user
             else:
-                logger.debug(f"No user found with ID: {user_id}")
+                logger.debug("No user found with ID: %s", user_id)
                 return None
                 
-        except Exception as e:
-            logger.error(f"Error searching user by ID {user_id}: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            logger.exception("Error searching user by ID %s", user_id)
             return None
 
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[User]:
+        # Satu query IN untuk DataLoader, urutan hasil tidak dijamin
+        if not user_ids:
+            return []
+        users = await self.db.reader.users.find_many(where={"user_id": {"in": user_ids}})
+        return [User(**{**user.dict(), "role": UserRole(user.role)}) for user in users]
+
     async def update_user_last_login(self, user_id: str):
         try:
-            logger.debug(f"Updating last login for user ID: {user_id}")
-            result = await self.db.users.update(
+            logger.debug("Updating last login for user ID: %s", user_id)
+            result = await self.db.writer.users.update(
                 where={"user_id": user_id},
-                data={"updated_at": datetime.utcnow()}
+                data={"updated_at": datetime.now(timezone.utc)}
             )
-            logger.debug(f"Last login updated successfully for user: {result.username}")
+            logger.debug("Last login updated successfully for user: %s", result.username)
+            await invalidate(self.db.writer, user_key(user_id))
             return result
         except Exception as e:
-            logger.error(f"Error updating last login for user {user_id}: {str(e)}")
+            logger.error("Error updating last login for user %s: %s", user_id, e)
             raise e
\ No newline at end of file
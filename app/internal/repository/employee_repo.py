@@ -1,16 +1,70 @@
-from datetime import datetime
-from typing import Optional, List, Tuple
-from prisma.models import employees
-from prisma import Prisma
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional, List, Sequence, Tuple
+from prisma.models import employees, employee_tombstones, photo_assets
+from prisma import Json
+from app.internal.config.settings import settings
+from app.internal.connection.prisma import DbSession
+from app.internal.connection.cache_invalidation import invalidate
+from app.internal.util.cache import REFERENCE_CACHE_KEYS, employee_key
 from app.dto.employee_dto import CreateEmployeeDto, UpdateEmployeeDto, EmployeeQueryDto
 
+# Watermark delta sync: (timestamp, id terakhir). id None berarti semua baris
+# dengan timestamp itu sudah terkirim, lanjut dari yang lebih baru.
+Watermark = Tuple[datetime, Optional[str]]
+
+EMPLOYEE_COLUMNS = (
+    "employee_id",
+    "employee_code",
+    "full_name",
+    "position",
+    "department",
+    "hire_date",
+    "basic_salary",
+    "email",
+    "phone",
+    "bank_account",
+    "bank_name",
+    "is_active",
+    "status",
+    "created_at",
+    "updated_at",
+    "photo_url",
+    "photo_variants",
+    "photo_digest",
+)
+
+
+def projected_columns(fields: Sequence[str]) -> List[str]:
+    # Nama kolom masuk ke SQL, jadi hanya kolom dari whitelist yang diterima.
+    # employee_id selalu ikut untuk memetakan hasil ke id yang diminta.
+    unknown = sorted(set(fields) - set(EMPLOYEE_COLUMNS))
+    if unknown:
+        raise ValueError(f"Unknown employee columns: {', '.join(unknown)}")
+    return [column for column in EMPLOYEE_COLUMNS if column == "employee_id" or column in fields]
+
+
+def after_watermark(column: str, id_column: str, after: Optional[Watermark]) -> dict:
+    if after is None:
+        return {}
+    at, last_id = after
+    if last_id is None:
+        return {column: {"gt": at}}
+    # Keyset (column, id) > (at, last_id), dilayani index (column, id)
+    return {"OR": [{column: {"gt": at}}, {column: at, id_column: {"gt": last_id}}]}
+
+
 class EmployeeRepository:
-    def __init__(self, db: Prisma):
-        self.prisma = db
+    def __init__(self, db: DbSession):
+        self.db = db
         
     
+    async def _invalidate_employee(self, employee_id: str) -> None:
+        # Cache employee + data referensi di semua worker ikut basi setelah write
+        await invalidate(self.db.writer, employee_key(employee_id), *REFERENCE_CACHE_KEYS)
+
     async def create(self, employee_data: CreateEmployeeDto) -> employees:
-        return await self.prisma.employees.create(
+        employee = await self.db.writer.employees.create(
             data= {
                 "employee_code": employee_data.employee_code,
                 "full_name": employee_data.full_name,
@@ -26,22 +80,42 @@ class EmployeeRepository:
                 "photo_url": employee_data.photo_url
             }
         )
+        await self._invalidate_employee(employee.employee_id)
+        return employee
     
     async def find_by_id(self, employee_id: str) -> Optional[employees]:
-        return await self.prisma.employees.find_unique(
+        return await self.db.reader.employees.find_unique(
             where={
                 "employee_id": employee_id   
                 }
             )
     
+    async def find_many_by_ids(self, employee_ids: List[str], fields: Optional[Sequence[str]] = None) -> List[employees]:
+        # Satu query IN untuk DataLoader/batch, urutan hasil tidak dijamin.
+        if not employee_ids:
+            return []
+        if fields:
+            # Prisma Python tidak punya select kolom skalar, proyeksi lewat raw SELECT.
+            # Hasilnya model parsial (kolom lain tidak ada), hanya untuk dibaca per field.
+            # unnest(text[]) supaya parameter tetap teks dan index employee_id terpakai.
+            rows = await self.db.reader.query_raw(
+                f"SELECT {', '.join(projected_columns(fields))} FROM employees "
+                "WHERE employee_id IN (SELECT unnest($1::text[])::uuid)",
+                employee_ids,
+            )
+            return [employees.model_construct(**row) for row in rows]
+        return await self.db.reader.employees.find_many(
+            where={"employee_id": {"in": employee_ids}}
+        )
+
     async def find_by_code(self, employee_code: str) -> Optional[employees]:
-        return await self.prisma.employees.find_unique(
+        return await self.db.primary.employees.find_unique(
             where={
                 "employee_code": employee_code   
                 }
             )
     async def find_by_email(self, email: str) -> Optional[employees]:
-        return await self.prisma.employees.find_first(
+        return await self.db.primary.employees.find_first(
             where={
                 "email": email
                 }
@@ -72,14 +146,14 @@ class EmployeeRepository:
         offset = (query.page - 1) * query.limit
 
         # execute query
-        employees_code = await self.prisma.employees.find_many(
+        employees_code = await self.db.reader.employees.find_many(
             where=where,
             take=query.limit,
             skip=offset,
             order=order
         )
 
-        total = await self.prisma.employees.count(where=where)
+        total = await self.db.reader.employees.count(where=where)
 
         return employees_code, total
     
@@ -109,31 +183,38 @@ class EmployeeRepository:
             update_data["is_active"] = employee_data.is_active
         if employee_data.photo_url is not None:
             update_data["photo_url"] = employee_data.photo_url
+        if employee_data.photo_variants is not None:
+            update_data["photo_variants"] = Json(employee_data.photo_variants)
+        if employee_data.photo_digest is not None:
+            update_data["photo_digest"] = employee_data.photo_digest
 
         # always update timestamp
-        update_data["updated_at"] = datetime.now()
+        update_data["updated_at"] = datetime.now(timezone.utc)
 
         if not update_data:
             return None
 
-        return await self.prisma.employees.update(
+        employee = await self.db.writer.employees.update(
             where={"employee_id": employee_id},
             data=update_data
         )
+        await self._invalidate_employee(employee_id)
+        return employee
     
     async def soft_delete(self, employee_id: str) -> bool:
         # soft delete implement
         try:
-            await self.prisma.update(
+            await self.db.writer.employees.update(
                 where = {
                     "employee_id": employee_id
                 },
                 data = {
                     "is_active": False,
                     "status": "INACTIVE",
-                    "updated_at": datetime.now()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             )
+            await self._invalidate_employee(employee_id)
 
             return True
         except Exception as e:
@@ -143,18 +224,48 @@ class EmployeeRepository:
     async def hard_delete(self, employee_id: str) -> bool:
         #permanent delete implement
         try: 
-            await self.prisma.employees.delete(
-                where = {
-                    "employee_id": employee_id
-                }
-            )
+            # Tombstone ditulis di transaksi yang sama supaya delta sync tidak kehilangan delete
+            deleted_at = datetime.now(timezone.utc)
+            async with self.db.writer.tx() as transaction:
+                await transaction.employees.delete(
+                    where = {
+                        "employee_id": employee_id
+                    }
+                )
+                await transaction.employee_tombstones.upsert(
+                    where={"employee_id": employee_id},
+                    data={
+                        "create": {"employee_id": employee_id, "deleted_at": deleted_at},
+                        "update": {"deleted_at": deleted_at},
+                    }
+                )
+            await self._invalidate_employee(employee_id)
             return True
         except Exception as e:
             return False
         
+    async def find_changed_since(
+        self, after: Optional[Watermark], until: datetime, limit: int
+    ) -> List[employees]:
+        # Baris yang dibuat/diubah/soft delete, urut (updated_at, employee_id)
+        return await self.db.reader.employees.find_many(
+            where={"AND": [after_watermark("updated_at", "employee_id", after), {"updated_at": {"lte": until}}]},
+            order=[{"updated_at": "asc"}, {"employee_id": "asc"}],
+            take=limit,
+        )
+
+    async def find_tombstones_since(
+        self, after: Optional[Watermark], until: datetime, limit: int
+    ) -> List[employee_tombstones]:
+        return await self.db.reader.employee_tombstones.find_many(
+            where={"AND": [after_watermark("deleted_at", "employee_id", after), {"deleted_at": {"lte": until}}]},
+            order=[{"deleted_at": "asc"}, {"employee_id": "asc"}],
+            take=limit,
+        )
+
     async def get_departments(self) -> List[str]:
 
-        result = await self.prisma.query_raw(
+        result = await self.db.reader.query_raw(
             "SELECT DISTINCT department FROM employees WHERE department IS NOT NULL AND is_active = true ORDER BY department"
         )
 
@@ -162,12 +273,56 @@ class EmployeeRepository:
     
     async def get_employee_count(self) -> dict:
 
-        total = await self.prisma.employees.count()
-        active = await self.prisma.employees.count(where={"is_active": True})
-        inactive = await self.prisma.employees.count(where={"is_active": False})
+        total = await self.db.reader.employees.count()
+        active = await self.db.reader.employees.count(where={"is_active": True})
+        inactive = await self.db.reader.employees.count(where={"is_active": False})
 
         return {
             "total": total,
             "active": active,
             "inactive": inactive
-        }
\ No newline at end of file
+        }
+
+    async def find_photo_asset(self, digest: str) -> Optional[photo_assets]:
+        return await self.db.primary.photo_assets.find_unique(
+            where={
+                "digest": digest
+                }
+            )
+
+    async def save_photo_asset(self, digest: str, url: str, variants: Optional[dict]) -> photo_assets:
+        data = {"url": url}
+        if variants is not None:
+            data["variants"] = Json(variants)
+        return await self.db.writer.photo_assets.upsert(
+            where={"digest": digest},
+            data={
+                "create": {"digest": digest, **data},
+                "update": data
+            }
+        )
+
+    @asynccontextmanager
+    async def photo_lock(self, digest: str) -> AsyncIterator[None]:
+        # Advisory lock per digest selama transaksi terbuka. Query di dalamnya
+        # lewat koneksi lain: lock hanya menyerialkan klaim dan pelepasan asset
+        # yang sama antar request/worker, jadi isinya harus singkat (tanpa I/O jaringan).
+        # Batas tunggu lock diset lokal, tidak ikut statement_timeout sesi.
+        lock_ms = str(int(settings.PHOTO_LOCK_TIMEOUT_SECONDS * 1000))
+        timeout = timedelta(seconds=settings.PHOTO_LOCK_TIMEOUT_SECONDS + settings.PHOTO_CLAIM_TIMEOUT_SECONDS)
+        async with self.db.writer.tx(timeout=timeout) as transaction:
+            await transaction.execute_raw(
+                "SELECT set_config('lock_timeout', $1, true), set_config('statement_timeout', $1, true)",
+                lock_ms,
+            )
+            await transaction.execute_raw("SELECT pg_advisory_xact_lock(hashtext($1))", digest)
+            yield
+
+    async def delete_photo_asset(self, digest: str) -> None:
+        await self.db.writer.photo_assets.delete_many(where={"digest": digest})
+
+    async def count_photo_references(self, digest: str, exclude_employee_id: Optional[str] = None) -> int:
+        where = {"photo_digest": digest}
+        if exclude_employee_id:
+            where["NOT"] = {"employee_id": exclude_employee_id}
+        return await self.db.primary.employees.count(where=where)
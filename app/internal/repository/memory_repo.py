@@ -0,0 +1,438 @@
+import asyncio
+import bisect
+import random
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from app.domain.user_model import User, UserRole
+from app.internal.util.synthetic_data import (
+    DEPARTMENTS,
+    FIRST_NAMES,
+    HRD_USERNAME,
+    LAST_NAMES,
+    email_for,
+    employee_id,
+    employee_username,
+)
+from app.internal.connection.cache_invalidation import invalidate
+from app.internal.util.cache import REFERENCE_CACHE_KEYS, employee_key, user_key
+from app.dto.employee_dto import CreateEmployeeDto, UpdateEmployeeDto, EmployeeQueryDto
+
+# Backend repository in-memory untuk benchmark stack HTTP/serialisasi dan
+# test konkurensi tinggi tanpa Postgres. Semantik mengikuti repository Prisma
+# (contains case-insensitive, NULL di akhir saat ASC), tapi tanpa I/O sama sekali.
+
+
+@dataclass
+class EmployeeRecord:
+    employee_id: str
+    employee_code: str
+    full_name: str
+    position: str
+    hire_date: datetime
+    basic_salary: Decimal
+    department: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    bank_account: Optional[str] = None
+    bank_name: Optional[str] = None
+    is_active: Optional[bool] = True
+    status: str = "ACTIVE"
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    photo_url: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
+    photo_digest: Optional[str] = None
+
+
+@dataclass
+class PhotoAssetRecord:
+    digest: str
+    url: str
+    variants: Optional[Dict[str, str]] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class TombstoneRecord:
+    employee_id: str
+    deleted_at: datetime
+
+
+EMPLOYEE_FIELDS = frozenset(item.name for item in fields(EmployeeRecord))
+
+# Kolom yang boleh dipakai sort_by, masing-masing punya list terurut sendiri
+SORTABLE_COLUMNS = (
+    "full_name",
+    "employee_code",
+    "position",
+    "department",
+    "hire_date",
+    "basic_salary",
+    "created_at",
+    "updated_at",
+)
+
+
+def sort_key(record: EmployeeRecord, column: str) -> Tuple:
+    value = getattr(record, column)
+    # (is None, value, id): NULL di akhir seperti Postgres, id sebagai tie-breaker
+    return (value is None, value, record.employee_id)
+
+
+def contains(value: Optional[str], needle: str) -> bool:
+    return value is not None and needle in value.lower()
+
+
+class InMemoryStore:
+    # Data dipakai bersama semua request; repository per request hanya view.
+    # Semua method sinkron dan dipanggil dari event loop, jadi tidak butuh lock.
+
+    def __init__(self):
+        self.employees: Dict[str, EmployeeRecord] = {}
+        self.employee_by_code: Dict[str, str] = {}
+        self.employee_by_email: Dict[str, Set[str]] = {}
+        self.employee_by_digest: Dict[str, Set[str]] = {}
+        self.sorted_employees: Dict[str, List[Tuple]] = {column: [] for column in SORTABLE_COLUMNS}
+        self.active_departments: Counter = Counter()
+        self.active_count = 0
+        self.photo_assets: Dict[str, PhotoAssetRecord] = {}
+        self.photo_locks: Dict[str, asyncio.Lock] = {}
+        self.tombstones: Dict[str, TombstoneRecord] = {}
+
+        self.users: Dict[str, User] = {}
+        self.user_by_username: Dict[str, str] = {}
+        self.user_by_email: Dict[str, str] = {}
+
+    # Employee index
+
+    def _index(self, record: EmployeeRecord) -> None:
+        self.employees[record.employee_id] = record
+        self.employee_by_code[record.employee_code] = record.employee_id
+        if record.email:
+            self.employee_by_email.setdefault(record.email, set()).add(record.employee_id)
+        if record.photo_digest:
+            self.employee_by_digest.setdefault(record.photo_digest, set()).add(record.employee_id)
+        for column, ordered in self.sorted_employees.items():
+            bisect.insort(ordered, sort_key(record, column))
+        if record.is_active:
+            self.active_count += 1
+            if record.department:
+                self.active_departments[record.department] += 1
+
+    def _unindex(self, record: EmployeeRecord) -> None:
+        del self.employees[record.employee_id]
+        self.employee_by_code.pop(record.employee_code, None)
+        for index, key in ((self.employee_by_email, record.email), (self.employee_by_digest, record.photo_digest)):
+            if key and key in index:
+                index[key].discard(record.employee_id)
+                if not index[key]:
+                    del index[key]
+        for column, ordered in self.sorted_employees.items():
+            key = sort_key(record, column)
+            position = bisect.bisect_left(ordered, key)
+            if position < len(ordered) and ordered[position] == key:
+                del ordered[position]
+        if record.is_active:
+            self.active_count -= 1
+            if record.department:
+                self.active_departments[record.department] -= 1
+                if self.active_departments[record.department] <= 0:
+                    del self.active_departments[record.department]
+
+    def add_employee(self, record: EmployeeRecord) -> EmployeeRecord:
+        existing = self.employee_by_code.get(record.employee_code)
+        if existing and existing != record.employee_id:
+            # Sama seperti unique constraint employee_code di database
+            raise ValueError(f"Unique constraint failed on employee_code: {record.employee_code}")
+        if record.employee_id in self.employees:
+            self._unindex(self.employees[record.employee_id])
+        self._index(record)
+        return record
+
+    def replace_employee(self, employee_id: str, **changes: Any) -> Optional[EmployeeRecord]:
+        current = self.employees.get(employee_id)
+        if current is None:
+            return None
+        updated = replace(current, **changes)
+        self._unindex(current)
+        try:
+            return self.add_employee(updated)
+        except ValueError:
+            self._index(current)
+            raise
+
+    def remove_employee(self, employee_id: str) -> bool:
+        current = self.employees.get(employee_id)
+        if current is None:
+            return False
+        self._unindex(current)
+        return True
+
+    def iter_sorted(self, column: str, descending: bool) -> Iterator[EmployeeRecord]:
+        ordered = self.sorted_employees[column]
+        keys = reversed(ordered) if descending else ordered
+        for key in keys:
+            yield self.employees[key[-1]]
+
+    # User index
+
+    def add_user(self, user: User) -> User:
+        previous = self.users.get(user.user_id)
+        if previous:
+            self.user_by_username.pop(previous.username, None)
+            self.user_by_email.pop(previous.email, None)
+        self.users[user.user_id] = user
+        self.user_by_username[user.username] = user.user_id
+        self.user_by_email[user.email] = user.user_id
+        return user
+
+
+class InMemoryEmployeeRepository:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def _invalidate_employee(self, employee_id: str) -> None:
+        # Tanpa Postgres tidak ada NOTIFY, cukup cache proses ini
+        await invalidate(None, employee_key(employee_id), *REFERENCE_CACHE_KEYS)
+
+    async def create(self, employee_data: CreateEmployeeDto) -> EmployeeRecord:
+        now = datetime.now(timezone.utc)
+        record = EmployeeRecord(
+            employee_id=str(uuid.uuid4()),
+            employee_code=employee_data.employee_code,
+            full_name=employee_data.full_name,
+            position=employee_data.position,
+            department=employee_data.department,
+            hire_date=employee_data.hire_date,
+            basic_salary=employee_data.basic_salary,
+            email=employee_data.email,
+            phone=employee_data.phone,
+            bank_account=employee_data.bank_account,
+            bank_name=employee_data.bank_name,
+            status=employee_data.status.value,
+            photo_url=employee_data.photo_url,
+            created_at=now,
+            updated_at=now,
+        )
+        self.store.add_employee(record)
+        await self._invalidate_employee(record.employee_id)
+        return record
+
+    async def find_by_id(self, employee_id: str) -> Optional[EmployeeRecord]:
+        return self.store.employees.get(employee_id)
+
+    async def find_many_by_ids(self, employee_ids: List[str], fields: Optional[Sequence[str]] = None) -> List[EmployeeRecord]:
+        # Record sudah ada di memori, proyeksi `fields` cukup di service
+        employees = (self.store.employees.get(employee_id) for employee_id in employee_ids)
+        return [employee for employee in employees if employee is not None]
+
+    async def find_by_code(self, employee_code: str) -> Optional[EmployeeRecord]:
+        employee_id = self.store.employee_by_code.get(employee_code)
+        return self.store.employees.get(employee_id) if employee_id else None
+
+    async def find_by_email(self, email: str) -> Optional[EmployeeRecord]:
+        employee_ids = self.store.employee_by_email.get(email)
+        return self.store.employees[min(employee_ids)] if employee_ids else None
+
+    async def find_all(self, query: EmployeeQueryDto) -> Tuple[List[EmployeeRecord], int]:
+        if query.sort_by and query.sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Unsupported sort field: {query.sort_by}")
+
+        offset = (query.page - 1) * query.limit
+        if query.sort_by:
+            candidates = self.store.iter_sorted(query.sort_by, query.sort_order == "desc")
+        else:
+            candidates = iter(self.store.employees.values())
+
+        search = query.search.lower() if query.search else None
+        department = query.department.lower() if query.department else None
+        if search is None and department is None and query.is_active is None:
+            # Tanpa filter: langsung potong list terurut, total dari index
+            page = [record for _, record in zip(range(offset + query.limit), candidates)][offset:]
+            return page, len(self.store.employees)
+
+        page = []
+        total = 0
+        for record in candidates:
+            if query.is_active is not None and bool(record.is_active) != query.is_active:
+                continue
+            if department is not None and not contains(record.department, department):
+                continue
+            if search is not None and not (
+                contains(record.full_name, search)
+                or contains(record.employee_code, search)
+                or contains(record.position, search)
+            ):
+                continue
+            if offset <= total < offset + query.limit:
+                page.append(record)
+            total += 1
+        return page, total
+
+    async def update(self, employee_id: str, employee_data: UpdateEmployeeDto) -> Optional[EmployeeRecord]:
+        changes = {
+            name: value
+            for name, value in employee_data.model_dump(exclude_none=True).items()
+            if name in EMPLOYEE_FIELDS
+        }
+        changes["updated_at"] = datetime.now(timezone.utc)
+        updated = self.store.replace_employee(employee_id, **changes)
+        await self._invalidate_employee(employee_id)
+        return updated
+
+    async def soft_delete(self, employee_id: str) -> bool:
+        updated = self.store.replace_employee(
+            employee_id, is_active=False, status="INACTIVE", updated_at=datetime.now(timezone.utc)
+        )
+        await self._invalidate_employee(employee_id)
+        return updated is not None
+
+    async def hard_delete(self, employee_id: str) -> bool:
+        removed = self.store.remove_employee(employee_id)
+        if removed:
+            self.store.tombstones[employee_id] = TombstoneRecord(employee_id, datetime.now(timezone.utc))
+        await self._invalidate_employee(employee_id)
+        return removed
+
+    async def find_changed_since(
+        self, after: Optional[Tuple[datetime, Optional[str]]], until: datetime, limit: int
+    ) -> List[EmployeeRecord]:
+        # Pakai list terurut updated_at: key (is None, updated_at, id)
+        ordered = self.store.sorted_employees["updated_at"]
+        start = 0
+        if after is not None:
+            at, last_id = after
+            # "\uffff" lebih besar dari id mana pun: lewati semua baris di `at`
+            start = bisect.bisect_right(ordered, (False, at, last_id if last_id is not None else "\uffff"))
+        result = []
+        for is_null, updated_at, employee_id in ordered[start:]:
+            if is_null or updated_at > until or len(result) >= limit:
+                break
+            result.append(self.store.employees[employee_id])
+        return result
+
+    async def find_tombstones_since(
+        self, after: Optional[Tuple[datetime, Optional[str]]], until: datetime, limit: int
+    ) -> List[TombstoneRecord]:
+        tombstones = sorted(self.store.tombstones.values(), key=lambda item: (item.deleted_at, item.employee_id))
+        if after is not None:
+            at, last_id = after
+            tombstones = [
+                item for item in tombstones
+                if item.deleted_at > at or (last_id is not None and item.deleted_at == at and item.employee_id > last_id)
+            ]
+        return [item for item in tombstones if item.deleted_at <= until][:limit]
+
+    async def get_departments(self) -> List[str]:
+        return sorted(self.store.active_departments)
+
+    async def get_employee_count(self) -> dict:
+        total = len(self.store.employees)
+        active = self.store.active_count
+        inactive = sum(1 for record in self.store.employees.values() if record.is_active is False)
+        return {
+            "total": total,
+            "active": active,
+            "inactive": inactive
+        }
+
+    async def find_photo_asset(self, digest: str) -> Optional[PhotoAssetRecord]:
+        return self.store.photo_assets.get(digest)
+
+    async def save_photo_asset(self, digest: str, url: str, variants: Optional[dict]) -> PhotoAssetRecord:
+        asset = self.store.photo_assets.get(digest)
+        if asset is None:
+            asset = self.store.photo_assets[digest] = PhotoAssetRecord(digest=digest, url=url, variants=variants)
+        else:
+            asset.url = url
+            if variants is not None:
+                asset.variants = variants
+        return asset
+
+    @asynccontextmanager
+    async def photo_lock(self, digest: str) -> AsyncIterator[None]:
+        # Satu proses, cukup asyncio.Lock per digest
+        async with self.store.photo_locks.setdefault(digest, asyncio.Lock()):
+            yield
+
+    async def delete_photo_asset(self, digest: str) -> None:
+        self.store.photo_assets.pop(digest, None)
+
+    async def count_photo_references(self, digest: str, exclude_employee_id: Optional[str] = None) -> int:
+        employee_ids = self.store.employee_by_digest.get(digest, set())
+        return len(employee_ids - {exclude_employee_id}) if exclude_employee_id else len(employee_ids)
+
+
+class InMemoryAuthRepository:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        user_id = self.store.user_by_username.get(username)
+        return self.store.users.get(user_id) if user_id else None
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        user_id = self.store.user_by_email.get(email)
+        return self.store.users.get(user_id) if user_id else None
+
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        return self.store.users.get(user_id)
+
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[User]:
+        users = (self.store.users.get(user_id) for user_id in user_ids)
+        return [user for user in users if user is not None]
+
+    async def update_user_last_login(self, user_id: str) -> Optional[User]:
+        user = self.store.users.get(user_id)
+        if user is None:
+            raise ValueError(f"User not found: {user_id}")
+        updated = self.store.add_user(user.model_copy(update={"updated_at": datetime.now(timezone.utc)}))
+        await invalidate(None, user_key(user_id))
+        return updated
+
+
+def populate(store: InMemoryStore, employees: int, password_hash: str, seed: int = 42) -> None:
+    # Data sintetis deterministik dengan penamaan synthetic_data (sama dengan load test)
+    # (lt_hrd + lt_user_{i}), jadi driver load test bisa langsung login ke sini
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    departments = list(DEPARTMENTS)
+    for index in range(employees):
+        department = rng.choice(departments)
+        username = employee_username(index)
+        record = store.add_employee(EmployeeRecord(
+            employee_id=employee_id(index),
+            employee_code=f"EMP{index:07d}",
+            full_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            position=rng.choice(DEPARTMENTS[department]),
+            department=department,
+            # hire_date tanggal kalender, naive seperti input API
+            hire_date=now.replace(tzinfo=None) - timedelta(days=rng.randint(30, 3650)),
+            basic_salary=Decimal(rng.randrange(5_000_000, 40_000_000, 50_000)),
+            email=email_for(username),
+            is_active=rng.random() >= 0.05,
+            created_at=now,
+            updated_at=now,
+        ))
+        store.add_user(User(
+            user_id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            username=username,
+            email=record.email,
+            password=password_hash,
+            role=UserRole.EMPLOYEE,
+            employee_id=record.employee_id,
+            created_at=now,
+        ))
+    store.add_user(User(
+        user_id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        username=HRD_USERNAME,
+        email=email_for(HRD_USERNAME),
+        password=password_hash,
+        role=UserRole.HRD,
+        created_at=now,
+    ))
@@ -0,0 +1,74 @@
+from typing import List, Optional
+from app.internal.connection.asyncpg_pool import get_pg_pool, use_fast_path
+from app.internal.connection.instrumentation import query_timer
+from app.internal.util.deadline import DeadlineExceeded, remaining_time
+from app.internal.repository.auth_repo import AuthRepository
+from app.domain.user_model import User, UserRole
+import logging
+
+logger = logging.getLogger(__name__)
+
+USER_COLUMNS = (
+    "user_id",
+    "username",
+    "email",
+    "password",
+    "role",
+    "employee_id",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+SELECT_USER = f"SELECT {', '.join(USER_COLUMNS)} FROM users"
+
+USER_BY_USERNAME_SQL = f"{SELECT_USER} WHERE username = $1"
+USER_BY_EMAIL_SQL = f"{SELECT_USER} WHERE email = $1"
+USER_BY_ID_SQL = f"{SELECT_USER} WHERE user_id = $1::uuid"
+USERS_BY_IDS_SQL = f"{SELECT_USER} WHERE user_id = ANY($1::uuid[])"
+
+
+def user_from_row(row) -> User:
+    user_dict = dict(row)
+    user_dict['role'] = UserRole(user_dict['role'])
+    if user_dict['is_active'] is None:
+        user_dict['is_active'] = True
+    return User(**user_dict)
+
+
+class PgAuthRepository(AuthRepository):
+    # Lookup principal lewat asyncpg, update last login tetap lewat Prisma
+
+    async def _fetch_user(self, sql: str, value: str) -> Optional[User]:
+        try:
+            with query_timer("users", "pg_find_unique"):
+                row = await get_pg_pool(replica=self.db.prefers_replica).fetchrow(sql, value, timeout=remaining_time())
+            return user_from_row(row) if row else None
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            logger.exception("Error fetching user via asyncpg")
+            return None
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        if not use_fast_path("get_user_by_username"):
+            return await super().get_user_by_username(username)
+        return await self._fetch_user(USER_BY_USERNAME_SQL, username)
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        if not use_fast_path("get_user_by_email"):
+            return await super().get_user_by_email(email)
+        return await self._fetch_user(USER_BY_EMAIL_SQL, email)
+
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        if not use_fast_path("get_user_by_id"):
+            return await super().get_user_by_id(user_id)
+        return await self._fetch_user(USER_BY_ID_SQL, user_id)
+
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[User]:
+        if not use_fast_path("get_users_by_ids") or not user_ids:
+            return await super().get_users_by_ids(user_ids)
+
+        with query_timer("users", "pg_find_many"):
+            rows = await get_pg_pool(replica=self.db.prefers_replica).fetch(USERS_BY_IDS_SQL, user_ids, timeout=remaining_time())
+        return [user_from_row(row) for row in rows]
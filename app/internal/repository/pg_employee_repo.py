@@ -0,0 +1,123 @@
+from datetime import date, datetime, time
+from typing import Optional, List, Sequence, Tuple
+from prisma.models import employees
+from app.internal.connection.asyncpg_pool import get_pg_pool, use_fast_path
+from app.internal.connection.instrumentation import query_timer
+from app.internal.util.deadline import remaining_time
+from app.internal.repository.employee_repo import EMPLOYEE_COLUMNS, EmployeeRepository, projected_columns
+from app.dto.employee_dto import EmployeeQueryDto
+
+SELECT_EMPLOYEE = f"SELECT {', '.join(EMPLOYEE_COLUMNS)} FROM employees"
+
+FIND_BY_ID_SQL = f"{SELECT_EMPLOYEE} WHERE employee_id = $1::uuid"
+FIND_BY_IDS_SQL = f"{SELECT_EMPLOYEE} WHERE employee_id = ANY($1::uuid[])"
+
+DEPARTMENTS_SQL = (
+    "SELECT DISTINCT department FROM employees "
+    "WHERE department IS NOT NULL AND is_active = true ORDER BY department"
+)
+
+
+def like_pattern(value: str) -> str:
+    # Sama seperti "contains" di Prisma: wildcard literal harus di-escape
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def employee_from_row(row) -> employees:
+    data = dict(row)
+    data.pop("total_count", None)
+    hire_date = data.get("hire_date")
+    if isinstance(hire_date, date) and not isinstance(hire_date, datetime):
+        data["hire_date"] = datetime.combine(hire_date, time.min)
+    # Data dari DB sudah valid, skip validasi pydantic
+    return employees.model_construct(**data)
+
+
+class PgEmployeeRepository(EmployeeRepository):
+    # Read path panas lewat asyncpg (prepared statement), write tetap lewat Prisma.
+    # Tiap method bisa dimatikan lewat ASYNCPG_FAST_METHODS.
+
+    def _pool(self):
+        return get_pg_pool(replica=self.db.prefers_replica)
+
+    async def find_by_id(self, employee_id: str) -> Optional[employees]:
+        if not use_fast_path("find_by_id"):
+            return await super().find_by_id(employee_id)
+
+        with query_timer("employees", "pg_find_by_id"):
+            row = await self._pool().fetchrow(FIND_BY_ID_SQL, employee_id, timeout=remaining_time())
+        return employee_from_row(row) if row else None
+
+    async def find_many_by_ids(self, employee_ids: List[str], fields: Optional[Sequence[str]] = None) -> List[employees]:
+        if not use_fast_path("find_many_by_ids") or not employee_ids:
+            return await super().find_many_by_ids(employee_ids, fields)
+
+        sql = FIND_BY_IDS_SQL
+        if fields:
+            # Proyeksi kolom: hanya kolom yang diminta yang dibaca dan dikirim
+            columns = projected_columns(fields)
+            sql = f"SELECT {', '.join(columns)} FROM employees WHERE employee_id = ANY($1::uuid[])"
+        with query_timer("employees", "pg_find_many_by_ids"):
+            rows = await self._pool().fetch(sql, employee_ids, timeout=remaining_time())
+        return [employee_from_row(row) for row in rows]
+
+    async def find_all(self, query: EmployeeQueryDto) -> Tuple[List[employees], int]:
+        if not use_fast_path("find_all") or (query.sort_by and query.sort_by not in EMPLOYEE_COLUMNS):
+            return await super().find_all(query)
+
+        conditions = []
+        args = []
+
+        if query.search:
+            args.append(like_pattern(query.search))
+            n = len(args)
+            conditions.append(
+                f"(full_name ILIKE ${n} OR employee_code ILIKE ${n} OR position ILIKE ${n})"
+            )
+
+        if query.department:
+            args.append(like_pattern(query.department))
+            conditions.append(f"department ILIKE ${len(args)}")
+
+        if query.is_active is not None:
+            args.append(query.is_active)
+            conditions.append(f"is_active = ${len(args)}")
+
+        where_sql = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        order_sql = ""
+        if query.sort_by:
+            direction = "DESC" if query.sort_order == "desc" else "ASC"
+            order_sql = f" ORDER BY {query.sort_by} {direction}"
+
+        offset = (query.page - 1) * query.limit
+        args.extend([query.limit, offset])
+
+        # Total dihitung di query yang sama, hemat satu round trip
+        sql = (
+            f"SELECT {', '.join(EMPLOYEE_COLUMNS)}, count(*) OVER () AS total_count "
+            f"FROM employees{where_sql}{order_sql} "
+            f"LIMIT ${len(args) - 1} OFFSET ${len(args)}"
+        )
+
+        pool = self._pool()
+        with query_timer("employees", "pg_find_all"):
+            rows = await pool.fetch(sql, *args, timeout=remaining_time())
+        if rows:
+            total = rows[0]["total_count"]
+        else:
+            # Halaman di luar range, total tetap perlu dihitung
+            with query_timer("employees", "pg_count"):
+                total = await pool.fetchval(
+                    f"SELECT count(*) FROM employees{where_sql}", *args[:-2], timeout=remaining_time()
+                )
+
+        return [employee_from_row(row) for row in rows], total
+
+    async def get_departments(self) -> List[str]:
+        if not use_fast_path("get_departments"):
+            return await super().get_departments()
+
+        with query_timer("employees", "pg_get_departments"):
+            rows = await self._pool().fetch(DEPARTMENTS_SQL, timeout=remaining_time())
+        return [row["department"] for row in rows if row["department"]]
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Any, AsyncContextManager, List, Optional, Protocol, Sequence, Tuple
+from app.domain.user_model import User
+from app.dto.employee_dto import CreateEmployeeDto, UpdateEmployeeDto, EmployeeQueryDto
+
+# Kontrak repository yang dipakai service. Implementasi: Prisma
+# (EmployeeRepository/AuthRepository), asyncpg (Pg*), dan in-memory
+# (InMemory*) untuk benchmark/test tanpa Postgres.
+#
+# Record employee cukup punya atribut yang sama dengan model Prisma
+# `employees`; DTO response dibangun dengan from_attributes.
+
+
+class EmployeeRepositoryProtocol(Protocol):
+    async def create(self, employee_data: CreateEmployeeDto) -> Any: ...
+
+    async def find_by_id(self, employee_id: str) -> Optional[Any]: ...
+
+    async def find_many_by_ids(self, employee_ids: List[str], fields: Optional[Sequence[str]] = None) -> List[Any]: ...
+
+    async def find_by_code(self, employee_code: str) -> Optional[Any]: ...
+
+    async def find_by_email(self, email: str) -> Optional[Any]: ...
+
+    async def find_all(self, query: EmployeeQueryDto) -> Tuple[List[Any], int]: ...
+
+    async def update(self, employee_id: str, employee_data: UpdateEmployeeDto) -> Optional[Any]: ...
+
+    async def soft_delete(self, employee_id: str) -> bool: ...
+
+    async def hard_delete(self, employee_id: str) -> bool: ...
+
+    async def find_changed_since(self, after: Optional[Tuple[datetime, Optional[str]]], until: datetime, limit: int) -> List[Any]: ...
+
+    async def find_tombstones_since(self, after: Optional[Tuple[datetime, Optional[str]]], until: datetime, limit: int) -> List[Any]: ...
+
+    async def get_departments(self) -> List[str]: ...
+
+    async def get_employee_count(self) -> dict: ...
+
+    async def find_photo_asset(self, digest: str) -> Optional[Any]: ...
+
+    async def save_photo_asset(self, digest: str, url: str, variants: Optional[dict]) -> Any: ...
+
+    def photo_lock(self, digest: str) -> AsyncContextManager[None]: ...
+
+    async def delete_photo_asset(self, digest: str) -> None: ...
+
+    async def count_photo_references(self, digest: str, exclude_employee_id: Optional[str] = None) -> int: ...
+
+
+class AuthRepositoryProtocol(Protocol):
+    async def get_user_by_username(self, username: str) -> Optional[User]: ...
+
+    async def get_user_by_email(self, email: str) -> Optional[User]: ...
+
+    async def get_user_by_id(self, user_id: str) -> Optional[User]: ...
+
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[User]: ...
+
+    async def update_user_last_login(self, user_id: str) -> Any: ...
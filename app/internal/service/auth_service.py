@@ -1,67 +1,75 @@
 from datetime import timedelta
+from typing import Dict, List, Optional
 from fastapi import HTTPException, status
-from app.internal.repository.auth_repo import AuthRepository
-from app.internal.util.auth import verify_password, create_access_token, verify_token
+from app.internal.connection.prisma import primary_reads
+from app.internal.repository.protocols import AuthRepositoryProtocol
+from app.internal.util.auth import verify_password_async, create_access_token, verify_token
 from app.dto.auth_dto import LoginRequestDTO, LoginResponseDTO, UserProfileDTO
 from app.domain.user_model import User
 from app.internal.config.settings import settings
+from app.internal.util.cache import shared_cache, user_key
+from app.internal.util.dataloader import DataLoader, read_group, user_batcher
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class AuthService:
-    def __init__(self, auth_repo: AuthRepository):
+    def __init__(self, auth_repo: AuthRepositoryProtocol):
         self.auth_repo = auth_repo
+        # Lookup principal dari request-request yang datang bersamaan digabung
+        # jadi satu query IN; hasilnya di-cache per request
+        self.user_loader: DataLoader[str, User] = DataLoader(
+            user_batcher, self._batch_load_users, lambda: read_group(self.auth_repo)
+        )
+
+    async def _batch_load_users(self, user_ids: List[str]) -> Dict[str, User]:
+        users = await self.auth_repo.get_users_by_ids(user_ids)
+        return {user.user_id: user for user in users}
 
     async def authenticate_user(self, login_data: LoginRequestDTO) -> LoginResponseDTO:
-        logger.info(f"Starting authentication for username: {login_data.username}")
+        logger.info("Starting authentication for username: %s", login_data.username)
         
         try:
             # Cari user berdasarkan username
-            logger.debug(f"Searching user by username: {login_data.username}")
+            logger.debug("Searching user by username: %s", login_data.username)
             user = await self.auth_repo.get_user_by_username(login_data.username)
             
             if not user:
-                logger.debug(f"User not found by username, trying email: {login_data.username}")
+                logger.debug("User not found by username, trying email: %s", login_data.username)
                 user = await self.auth_repo.get_user_by_email(login_data.username)
 
             # Jika user tidak ditemukan
             if not user:
-                logger.warning(f"User not found: {login_data.username}")
+                logger.warning("User not found: %s", login_data.username)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Incorrect username or password"
                 )
 
-            logger.info(f"User found: {user.username}, role: {user.role}, active: {user.is_active}")
+            logger.info("User found: %s, role: %s, active: %s", user.username, user.role, user.is_active)
 
             # Check if user is active
             if not user.is_active:
-                logger.warning(f"User is inactive: {user.username}")
+                logger.warning("User is inactive: %s", user.username)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Account is inactive"
                 )
 
-            # Log password verification attempt
-            logger.debug(f"Verifying password for user: {user.username}")
-            logger.debug(f"Plain password length: {len(login_data.password)}")
-            logger.debug(f"Hashed password from DB: {user.password[:50]}...")  # Only log first 50 chars
+            logger.debug("Verifying password for user: %s", user.username)
             
             # Verify password
-            password_valid = verify_password(login_data.password, user.password)
-            logger.debug(f"Password verification result: {password_valid}")
+            password_valid = await verify_password_async(login_data.password, user.password)
+            logger.debug("Password verification result: %s", password_valid)
             
             if not password_valid:
-                logger.warning(f"Invalid password for user: {user.username}")
+                logger.warning("Invalid password for user: %s", user.username)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Incorrect username or password"
                 )
 
-            logger.info(f"Authentication successful for user: {user.username}")
+            logger.info("Authentication successful for user: %s", user.username)
 
             # Generate access token
             access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -72,7 +80,7 @@ class AuthService:
                 "employee_id": user.employee_id
             }
             
-            logger.debug(f"Creating token with data: {token_data}")
+            logger.debug("Creating token for user: %s", user.username)
             access_token = create_access_token(
                 data=token_data,
                 expires_delta=access_token_expires
@@ -80,7 +88,7 @@ class AuthService:
 
             # Update last login
             await self.auth_repo.update_user_last_login(user.user_id)
-            logger.info(f"Updated last login for user: {user.username}")
+            logger.info("Updated last login for user: %s", user.username)
 
             response = LoginResponseDTO(
                 access_token=access_token,
@@ -92,24 +100,34 @@ class AuthService:
                 employee_id=user.employee_id
             )
             
-            logger.info(f"Login response created successfully for user: {user.username}")
+            logger.info("Login response created successfully for user: %s", user.username)
             return response
 
         except HTTPException as he:
-            logger.error(f"HTTP Exception during authentication: {he.detail}")
+            logger.warning("HTTP Exception during authentication: %s", he.detail)
             raise he
         except Exception as e:
-            logger.error(f"Unexpected error during authentication: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Unexpected error during authentication")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Authentication service error: {str(e)}"
             )
 
+    async def _get_principal(self, user_id: str) -> Optional[User]:
+        # Dipanggil tiap request terautentikasi; hash password tidak ikut di-cache
+        cached = await shared_cache.get(user_key(user_id))
+        if cached is not None:
+            return User.model_validate({**cached, "password": ""})
+
+        # Yang akan di-cache dibaca dari primary (lihat EmployeeService._fill)
+        with primary_reads():
+            user = await self.user_loader.load(user_id)
+        if user:
+            await shared_cache.set(user_key(user_id), user.model_dump(mode="json", exclude={"password"}))
+        return user
+
     async def get_current_user(self, token: str) -> User:
-        logger.debug(f"Getting current user from token")
+        logger.debug("Getting current user from token")
         
         try:
             payload = verify_token(token)
@@ -119,29 +137,29 @@ class AuthService:
                 logger.warning("No user_id found in token payload")
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-            user = await self.auth_repo.get_user_by_id(user_id)
+            user = await self._get_principal(user_id)
             if not user:
-                logger.warning(f"User not found for user_id: {user_id}")
+                logger.warning("User not found for user_id: %s", user_id)
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
             
             if not user.is_active:
-                logger.warning(f"User is inactive: {user.username}")
+                logger.warning("User is inactive: %s", user.username)
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
 
-            logger.debug(f"Current user retrieved successfully: {user.username}")
+            logger.debug("Current user retrieved successfully: %s", user.username)
             return user
             
         except HTTPException as he:
             raise he
         except Exception as e:
-            logger.error(f"Error getting current user: {str(e)}")
+            logger.error("Error getting current user: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token validation failed"
             )
 
     async def get_user_profile(self, user_id: str) -> UserProfileDTO:
-        user = await self.auth_repo.get_user_by_id(user_id)
+        user = await self._get_principal(user_id)
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -1,59 +1,135 @@
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
-from typing import Optional, Dict, Any
-from fastapi import HTTPException, status, UploadFile
+import asyncio
+import hashlib
+import logging
+import time
 import uuid
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+from fastapi import HTTPException, status, UploadFile
+from starlette.concurrency import run_in_threadpool
 import os
 from pathlib import Path
+from app.internal.config.settings import settings
+from app.internal.service.image_service import ImageService
+from app.internal.util.metrics import CLOUDINARY_DURATION
+
+logger = logging.getLogger(__name__)
+
+MAX_PHOTO_BYTES = 10 * 1024 * 1024
+PHOTO_CHUNK_SIZE = 64 * 1024
+
+@lru_cache(maxsize=None)
+def cloudinary_sdk():
+    # SDK Cloudinary berat, di-import + config sekali saat pertama dipakai
+    import cloudinary
+    import cloudinary.uploader
+
+    # Configure Cloudinary (ambil dari environment variables)
+    cloudinary.config(
+        cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+        api_key=os.getenv("CLOUDINARY_API_KEY"),
+        api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+        secure=True
+    )
+    return cloudinary
+
 
 class CloudinaryService:
     def __init__(self):
-        # Configure Cloudinary (ambil dari environment variables)
-        cloudinary.config(
-            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-            api_key=os.getenv("CLOUDINARY_API_KEY"),
-            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-            secure=True
-        )
+        self.image_service = ImageService()
         
-    async def upload_employee_photo(
-        self, 
-        file: UploadFile, 
-        employee_id: str,
-        folder: str = "intern"
+    async def upload_image(
+        self,
+        content: bytes,
+        public_id: str,
+        transformation: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
+        # SDK Cloudinary blocking, jalankan di threadpool
+        options = {
+            "public_id": public_id,
+            "overwrite": True,
+            "resource_type": "image",
+        }
+        if transformation:
+            options["transformation"] = transformation
+        start = time.perf_counter()
         try:
-            # Validate file type
-            allowed_types = ["image/jpeg", "image/png", "image/jpg", "image/webp"]
-            if file.content_type not in allowed_types:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Only JPEG, PNG, and WebP images are allowed"
-                )
-            
-            # Validate file size (10MB max untuk Cloudinary)
-            if file.size and file.size > 10 * 1024 * 1024:
+            return await run_in_threadpool(cloudinary_sdk().uploader.upload, content, **options)
+        finally:
+            CLOUDINARY_DURATION.observe(time.perf_counter() - start, operation="upload")
+
+    async def upload_photo_variants(
+        self,
+        content: bytes,
+        public_id: str
+    ) -> Dict[str, Any]:
+        variants = await self.image_service.create_variants(content)
+
+        sizes = list(variants.keys())
+        results = await asyncio.gather(*[
+            self.upload_image(variants[size], f"{public_id}_{size}")
+            for size in sizes
+        ])
+        uploaded = dict(zip(sizes, results))
+
+        # Varian terbesar jadi photo_url utama
+        main = uploaded[max(sizes)]
+        return {
+            "url": main.get("secure_url"),
+            "public_id": main.get("public_id"),
+            "width": main.get("width"),
+            "height": main.get("height"),
+            "format": main.get("format"),
+            "bytes": main.get("bytes"),
+            "variants": {
+                str(size): result.get("secure_url")
+                for size, result in sorted(uploaded.items())
+            }
+        }
+
+    async def read_photo(self, file: UploadFile) -> Tuple[bytes, str]:
+        # Validate file type
+        allowed_types = ["image/jpeg", "image/png", "image/jpg", "image/webp"]
+        if file.content_type not in allowed_types:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only JPEG, PNG, and WebP images are allowed"
+            )
+        
+        # Validate file size (10MB max untuk Cloudinary)
+        if file.size and file.size > MAX_PHOTO_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File size must be less than 10MB"
+            )
+
+        # Baca per chunk sambil hitung sha256, jadi hash tidak perlu pass kedua
+        digest = hashlib.sha256()
+        content = bytearray()
+        while True:
+            chunk = await file.read(PHOTO_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            content.extend(chunk)
+            if len(content) > MAX_PHOTO_BYTES:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="File size must be less than 10MB"
                 )
-            
-            # Generate unique public_id
-            unique_id = f"{employee_id}_{uuid.uuid4().hex}"
-            public_id = f"{folder}/{unique_id}"
-            
-            # Read file content
-            file_content = await file.read()
-            
-            # Upload to Cloudinary
-            upload_result = cloudinary.uploader.upload(
-                file_content,
-                public_id=public_id,
-                folder=folder,
-                overwrite=True,  # Replace if exists
-                resource_type="image",
-                # Transformations for optimization
+
+        return bytes(content), digest.hexdigest()
+
+    async def upload_photo_content(self, content: bytes, public_id: str) -> Dict[str, Any]:
+        try:
+            # Resize + encode webp lokal, yang dikirim cuma thumbnail kecil
+            if self.image_service.is_available():
+                return await self.upload_photo_variants(content, public_id)
+
+            # Fallback tanpa Pillow: transformasi di sisi Cloudinary
+            upload_result = await self.upload_image(
+                content,
+                public_id,
                 transformation=[
                     {"width": 400, "height": 400, "crop": "fill", "quality": "auto"},
                     {"format": "webp"}  # Convert to WebP for better compression
@@ -66,10 +142,13 @@ class CloudinaryService:
                 "width": upload_result.get("width"),
                 "height": upload_result.get("height"),
                 "format": upload_result.get("format"),
-                "bytes": upload_result.get("bytes")
+                "bytes": upload_result.get("bytes"),
+                "variants": None
             }
             
-        except cloudinary.exceptions.Error as e:
+        except HTTPException:
+            raise
+        except cloudinary_sdk().exceptions.Error as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Cloudinary upload failed: {str(e)}"
@@ -79,15 +158,45 @@ class CloudinaryService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Photo upload failed: {str(e)}"
             )
+
+    def photo_public_id(self, digest: str, folder: Optional[str] = None) -> str:
+        # Digest + suffix acak: dedup lewat tabel photo_assets, tapi tiap upload
+        # dapat file sendiri, jadi destroy untuk asset yang sedang dilepas tidak
+        # pernah mengenai hasil upload yang sedang berjalan untuk gambar yang sama
+        return f"{folder or settings.CLOUDINARY_FOLDER}/{digest}-{uuid.uuid4().hex[:8]}"
+
+    async def upload_employee_photo(
+        self, 
+        file: UploadFile, 
+        employee_id: str,
+        folder: Optional[str] = None
+    ) -> Dict[str, Any]:
+        content, digest = await self.read_photo(file)
+        photo_info = await self.upload_photo_content(content, self.photo_public_id(digest, folder))
+        photo_info["digest"] = digest
+        return photo_info
     
     async def delete_employee_photo(self, public_id: str) -> bool:
         # Delete photo from Cloudinary
         try:
-            result = cloudinary.uploader.destroy(public_id)
+            start = time.perf_counter()
+            try:
+                result = await run_in_threadpool(cloudinary_sdk().uploader.destroy, public_id)
+            finally:
+                CLOUDINARY_DURATION.observe(time.perf_counter() - start, operation="destroy")
             return result.get("result") == "ok"
         except Exception as e:
-            print(f"Failed to delete photo from Cloudinary: {e}")
+            logger.warning("Failed to delete photo from Cloudinary: %s", e)
             return False
+
+    async def delete_photo_urls(self, urls: List[str]) -> None:
+        # Hapus foto utama beserta semua variannya
+        public_ids = {
+            public_id
+            for public_id in (self.extract_public_id_from_url(url) for url in urls if url)
+            if public_id
+        }
+        await asyncio.gather(*[self.delete_employee_photo(pid) for pid in public_ids])
     
     def extract_public_id_from_url(self, url: str) -> Optional[str]:
         # Extract public_id from Cloudinary URL
@@ -105,4 +214,10 @@ class CloudinaryService:
                     return public_id
             return None
         except Exception:
-            return None
\ No newline at end of file
+            return None
+
+
+@lru_cache(maxsize=None)
+def get_cloudinary_service() -> CloudinaryService:
+    # Stateless, cukup satu instance per proses
+    return CloudinaryService()
@@ -1,6 +1,12 @@
-from typing import List, Optional, Dict, Any
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status, UploadFile
-from app.internal.repository.employee_repo import EmployeeRepository
+from app.internal.connection.prisma import primary_reads
+from app.internal.repository.protocols import EmployeeRepositoryProtocol
+from app.internal.service.cloudinary_service import CloudinaryService
 from app.dto.employee_dto import (
     CreateEmployeeDto,
     UpdateEmployeeDto,
@@ -9,10 +15,72 @@ from app.dto.employee_dto import (
     EmployeeQueryDto
 )
 from app.domain.employe_model import Employee
+from app.internal.config.settings import settings
+from app.internal.util.cache import (
+    DEPARTMENTS_CACHE_KEY,
+    STATISTICS_CACHE_KEY,
+    employee_key,
+    shared_cache,
+)
+from app.internal.util.dataloader import DataLoader, employee_batcher, read_group
+from app.internal.util.event_bus import event_bus
+from app.internal.util.singleflight import employee_reads
+
+Watermark = Tuple[datetime, Optional[str]]
+
+
+def encode_sync_token(changes: Optional[Watermark], tombstones: Optional[Watermark]) -> str:
+    # Token opaque untuk client: base64 dari watermark employees dan tombstones
+    state = {
+        "c": [changes[0].isoformat(), changes[1]] if changes else None,
+        "t": [tombstones[0].isoformat(), tombstones[1]] if tombstones else None,
+    }
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Token lama berisi waktu naive; kolom timestamp disimpan dalam UTC
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+
+def decode_sync_token(token: str) -> Tuple[Optional[Watermark], Optional[Watermark]]:
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return tuple(
+            (_as_utc(datetime.fromisoformat(state[key][0])), state[key][1]) if state.get(key) else None
+            for key in ("c", "t")
+        )
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+
+
+def statistics_contribution(is_active: Optional[bool]) -> Dict[str, int]:
+    # Kontribusi satu employee ke get_employee_statistics
+    return {"total": 1, "active": int(is_active is True), "inactive": int(is_active is False)}
+
+
+def statistics_delta(before: Optional[Dict[str, int]], after: Optional[Dict[str, int]]) -> Dict[str, int]:
+    before = before or {}
+    after = after or {}
+    return {key: after.get(key, 0) - before.get(key, 0) for key in ("total", "active", "inactive")}
+
 
 class EmployeeService:
-    def __init__(self, employee_repo: EmployeeRepository):
+    def __init__(self, employee_repo: EmployeeRepositoryProtocol, cloudinary_service: Optional[CloudinaryService] = None):
         self.employee_repo = employee_repo
+        self.cloudinary_service = cloudinary_service
+        # Service dibuat per request, begitu juga cache loader-nya; batch query-nya
+        # digabung dengan request lain lewat employee_batcher
+        self.employee_loader: DataLoader[str, Any] = DataLoader(
+            employee_batcher, self._batch_load_employees, lambda: read_group(self.employee_repo)
+        )
+
+    async def _batch_load_employees(self, employee_ids: List[str]) -> Dict[str, Any]:
+        employees = await self.employee_repo.find_many_by_ids(employee_ids)
+        return {employee.employee_id: employee for employee in employees}
 
     # check if employee code already exists
     async def create_employee(self, employee_data: CreateEmployeeDto) -> EmployeeResponseDto:
@@ -32,24 +100,64 @@ class EmployeeService:
                     detail=f"employee with email '{employee_data.email}' already exists"
                 )
             
-            try:
-                employee = await self.employee_repo.create(employee_data)
-                return EmployeeResponseDto.model_validate(employee)
-            except Exception as e:
-                raise HTTPException(
-                    status_code= status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to create employe: {str(e)}"
-                )
+        try:
+            employee = await self.employee_repo.create(employee_data)
+            await event_bus.publish(
+                "employee.created",
+                employee_id=employee.employee_id,
+                statistics_delta=statistics_delta(None, statistics_contribution(employee.is_active)),
+            )
+            return EmployeeResponseDto.model_validate(employee)
+        except Exception as e:
+            raise HTTPException(
+                status_code= status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create employe: {str(e)}"
+            )
+
     async def get_employee_by_id(self, employee_id: str) -> EmployeeResponseDto:
-        employee = await self.employee_repo.find_by_id(employee_id)
-        if not employee:
+        employee = await self._cached(
+            employee_key(employee_id),
+            lambda: self._load_employee(employee_id),
+            settings.CACHE_L2_TTL_SECONDS,
+        )
+        if employee is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Employee not found"
             )
         return EmployeeResponseDto.model_validate(employee)
+
+    async def _load_employee(self, employee_id: str) -> Optional[Dict[str, Any]]:
+        employee = await self.employee_loader.load(employee_id)
+        if not employee:
+            return None
+        return EmployeeResponseDto.model_validate(employee).model_dump(mode="json")
+
+    async def _cached(self, key, loader, ttl: float):
+        # Stale-while-revalidate; miss dan refresh background tetap lewat singleflight
+        return await shared_cache.get_or_load(key, lambda: self._coalesce(key, lambda: self._fill(loader)), ttl)
+
+    @staticmethod
+    async def _fill(loader):
+        # Isi cache dari primary, replica bisa belum melihat write yang baru
+        # saja meng-invalidate key ini
+        with primary_reads():
+            return await loader()
     
+    async def _coalesce(self, key, factory):
+        # Session yang sudah menulis harus membaca datanya sendiri (read-your-writes),
+        # jangan ikut hasil query request lain
+        db = getattr(self.employee_repo, "db", None)
+        if getattr(db, "sticky", False):
+            return await factory()
+        # Read yang wajib dari primary tidak boleh menumpang query replica
+        return await employee_reads.do((key, getattr(db, "prefers_replica", True)), factory)
+
     async def get_employees(self, query: EmployeeQueryDto) -> Dict[str, Any]:
+        # Dashboard dibuka bersamaan: request list identik berbagi satu query
+        return await self._coalesce(("employees", query.model_dump_json()), lambda: self._fetch_employees(query))
+
+    async def _fetch_employees(self, query: EmployeeQueryDto) -> Dict[str, Any]:
         try:
             employess_data, total = await self.employee_repo.find_all(query)
 
@@ -74,6 +182,8 @@ class EmployeeService:
                     "has_previous": has_prev
                 }
             }
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -105,26 +215,11 @@ class EmployeeService:
                 )
         
         photo_info = None
-        
-        # Handle photo upload to Cloudinary (jika ada photo)
+        content = new_digest = None
+
         if photo:
             try:
-                # Delete old photo if exists
-                if existing_employee.photo_url:
-                    old_public_id = self.cloudinary_service.extract_public_id_from_url(
-                        existing_employee.photo_url
-                    )
-                    if old_public_id:
-                        await self.cloudinary_service.delete_employee_photo(old_public_id)
-                
-                # Upload new photo
-                photo_info = await self.cloudinary_service.upload_employee_photo(
-                    photo, employee_id
-                )
-                
-                # Update photo_url in employee_data
-                employee_data.photo_url = photo_info["url"]
-                
+                content, digest = await self.cloudinary_service.read_photo(photo)
             except HTTPException:
                 raise
             except Exception as e:
@@ -132,34 +227,99 @@ class EmployeeService:
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"Failed to upload photo: {str(e)}"
                 )
-        
+
+            if digest == existing_employee.photo_digest:
+                # Foto yang sama dikirim ulang, tidak perlu upload
+                photo_info = {
+                    "uploaded": False,
+                    "url": existing_employee.photo_url,
+                    "variants": existing_employee.photo_variants
+                }
+                if not employee_data.model_dump(exclude_none=True):
+                    # Tidak ada yang berubah: tanpa tulis updated_at, invalidasi cache, maupun event
+                    return self._with_photo_info(EmployeeResponseDto.model_validate(existing_employee), photo_info)
+            else:
+                new_digest = digest
+
+        if new_digest is None:
+            updated_employee = await self._apply_update(employee_id, employee_data, existing_employee)
+        else:
+            updated_employee, photo_info = await self._update_with_photo(
+                employee_id, employee_data, existing_employee, new_digest, content
+            )
+            # Foto lama dilepas setelah update berhasil
+            await self._release_photo(existing_employee)
+
+        return self._with_photo_info(EmployeeResponseDto.model_validate(updated_employee), photo_info)
+
+    async def _update_with_photo(self, employee_id: str, employee_data: UpdateEmployeeDto, existing_employee, digest: str, content: bytes):
+        # Upload (lambat, lewat jaringan) dikerjakan di luar photo_lock. Di dalam
+        # lock hanya cek dedup + klaim asset + update employee, supaya _release_photo
+        # di request lain tidak menghapus asset di antara cek dan update.
+        while True:
+            uploaded = None
+            if not await self._find_photo_asset(digest):
+                uploaded = await self._upload_photo(digest, content)
+
+            async with self.employee_repo.photo_lock(digest):
+                asset = await self._find_photo_asset(digest)
+                if asset is None and uploaded is None:
+                    # Asset dilepas request lain setelah cek pertama: upload lalu ulangi
+                    continue
+                if asset is None:
+                    photo_info = uploaded
+                    await self.employee_repo.save_photo_asset(digest, photo_info["url"], photo_info.get("variants"))
+                else:
+                    # Gambar identik cukup disimpan sekali
+                    photo_info = {"uploaded": False, "url": asset.url, "variants": asset.variants}
+
+                employee_data.photo_url = photo_info["url"]
+                employee_data.photo_variants = photo_info.get("variants")
+                employee_data.photo_digest = digest
+                updated_employee = await self._apply_update(employee_id, employee_data, existing_employee)
+
+            if uploaded is not None and asset is not None:
+                # Kalah balapan dengan upload lain untuk gambar yang sama
+                await self._delete_photo_files(uploaded["url"], uploaded.get("variants"))
+            return updated_employee, photo_info
+
+    async def _find_photo_asset(self, digest: str):
+        try:
+            return await self.employee_repo.find_photo_asset(digest)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to upload photo: {str(e)}"
+            )
+
+    async def _upload_photo(self, digest: str, content: bytes) -> Dict[str, Any]:
+        photo_info = await self.cloudinary_service.upload_photo_content(
+            content,
+            self.cloudinary_service.photo_public_id(digest)
+        )
+        photo_info["uploaded"] = True
+        return photo_info
+
+    async def _apply_update(self, employee_id: str, employee_data: UpdateEmployeeDto, existing_employee):
         try:
             updated_employee = await self.employee_repo.update(employee_id, employee_data)
+            self.employee_loader.clear(employee_id)
             if not updated_employee:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="No fields to update"
                 )
-            
-            # Convert to EmployeeResponseDto
-            employee_response = EmployeeResponseDto.model_validate(updated_employee)
-            
-            # Add photo info jika ada upload
-            if photo_info:
-                # Extend response dengan photo info
-                response_dict = employee_response.model_dump()
-                response_dict["photo_info"] = {
-                    "uploaded": True,
-                    "url": photo_info["url"],
-                    "size": photo_info["bytes"],
-                    "dimensions": f"{photo_info['width']}x{photo_info['height']}",
-                    "format": photo_info["format"]
-                }
-                
-                return response_dict
-            
-            return employee_response
-            
+            await event_bus.publish(
+                "employee.updated",
+                employee_id=employee_id,
+                statistics_delta=statistics_delta(
+                    statistics_contribution(existing_employee.is_active),
+                    statistics_contribution(updated_employee.is_active),
+                ),
+            )
+            return updated_employee
         except HTTPException:
             raise
         except Exception as e:
@@ -167,7 +327,48 @@ class EmployeeService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update employee: {str(e)}"
             )
-        
+
+    @staticmethod
+    def _with_photo_info(employee_response: EmployeeResponseDto, photo_info: Optional[Dict[str, Any]]):
+        if not photo_info:
+            return employee_response
+
+        # Extend response dengan photo info
+        response_dict = employee_response.model_dump()
+        response_dict["photo_info"] = {
+            "uploaded": photo_info["uploaded"],
+            "url": photo_info["url"],
+            "size": photo_info.get("bytes"),
+            "dimensions": f"{photo_info['width']}x{photo_info['height']}" if photo_info.get("width") else None,
+            "format": photo_info.get("format"),
+            "variants": photo_info.get("variants")
+        }
+        return response_dict
+
+    async def _release_photo(self, employee) -> None:
+        if not employee.photo_url:
+            return
+
+        if employee.photo_digest:
+            # Cek referensi dan hapus asset di bawah lock yang sama dengan
+            # _update_with_photo: asset yang sedang diklaim tidak ikut terhapus
+            async with self.employee_repo.photo_lock(employee.photo_digest):
+                references = await self.employee_repo.count_photo_references(employee.photo_digest)
+                if references > 0:
+                    # Masih dipakai employee lain, jangan dihapus dari storage
+                    return
+                await self.employee_repo.delete_photo_asset(employee.photo_digest)
+
+        # Di luar lock: URL ini tidak bisa diklaim lagi setelah asset-nya dihapus,
+        # upload baru selalu mendapat public_id sendiri
+        await self._delete_photo_files(employee.photo_url, employee.photo_variants)
+
+    async def _delete_photo_files(self, url: str, variants: Optional[Dict[str, str]]) -> None:
+        old_urls = [url]
+        if variants:
+            old_urls.extend(variants.values())
+        await self.cloudinary_service.delete_photo_urls(old_urls)
+
     async def delete_employee(self, employee_id:str, hard_delete: bool = False) -> dict[str, str]:
             employee = await self.employee_repo.find_by_id(employee_id)
             if not employee:
@@ -184,11 +385,22 @@ class EmployeeService:
                     success = await self.employee_repo.soft_delete(employee_id)
                     action = "deactivated"
                 
+                self.employee_loader.clear(employee_id)
                 if not success:
                     raise HTTPException(
                         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                         detail="Failed to delete employee"
                     )
+
+                await event_bus.publish(
+                    "employee.deleted",
+                    employee_id=employee_id,
+                    hard_delete=hard_delete,
+                    statistics_delta=statistics_delta(
+                        statistics_contribution(employee.is_active),
+                        None if hard_delete else statistics_contribution(False),
+                    ),
+                )
                 
                 return {
                     "message": f"Employee '{employee.full_name}' has been {action} successfully"
@@ -200,10 +412,13 @@ class EmployeeService:
                 )
             
     async def get_departments(self) -> List[str]:
-        
+        return await self._cached(DEPARTMENTS_CACHE_KEY, self._load_departments, settings.REFERENCE_CACHE_TTL_SECONDS)
+
+    async def _load_departments(self) -> List[str]:
         try:
             return await self.employee_repo.get_departments()
-        
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -211,14 +426,81 @@ class EmployeeService:
             )
     
     async def get_employee_statistics(self) -> dict[str, int]:
+        return await self._cached(STATISTICS_CACHE_KEY, self._load_statistics, settings.REFERENCE_CACHE_TTL_SECONDS)
+
+    async def _load_statistics(self) -> dict[str, int]:
         try:
             return await self.employee_repo.get_employee_count()
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to fetch employee statistics: {str(e)}"
             )
     
+    async def get_employees_batch(
+        self, employee_ids: List[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        employee_ids = list(dict.fromkeys(employee_ids))
+        try:
+            records = await self.employee_repo.find_many_by_ids(employee_ids, fields)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to fetch employees: {str(e)}"
+            )
+
+        by_id = {record.employee_id: record for record in records}
+        data = []
+        missing = []
+        # Urutan hasil mengikuti urutan id di request
+        for employee_id in employee_ids:
+            record = by_id.get(employee_id)
+            if record is None:
+                missing.append(employee_id)
+            elif fields:
+                data.append({field: getattr(record, field, None) for field in fields})
+            else:
+                data.append(EmployeeResponseDto.model_validate(record).model_dump())
+        return {"data": data, "missing": missing}
+
+    async def get_changes(self, token: Optional[str], limit: int) -> Dict[str, Any]:
+        changes_after, tombstones_after = decode_sync_token(token) if token else (None, None)
+        until = datetime.now(timezone.utc) - timedelta(seconds=settings.DELTA_SYNC_SAFETY_LAG_SECONDS)
+
+        try:
+            # limit + 1 untuk tahu masih ada halaman berikutnya
+            changed = await self.employee_repo.find_changed_since(changes_after, until, limit + 1)
+            deleted = await self.employee_repo.find_tombstones_since(tombstones_after, until, limit + 1)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to fetch employee changes: {str(e)}"
+            )
+
+        more_changes = len(changed) > limit
+        more_tombstones = len(deleted) > limit
+        changed = changed[:limit]
+        deleted = deleted[:limit]
+        # Halaman terpotong lanjut dari baris terakhir, selain itu semua s/d `until` sudah terkirim
+        next_changes = (changed[-1].updated_at, changed[-1].employee_id) if more_changes else (until, None)
+        next_tombstones = (deleted[-1].deleted_at, deleted[-1].employee_id) if more_tombstones else (until, None)
+
+        return {
+            "changes": [EmployeeResponseDto.model_validate(employee).model_dump() for employee in changed],
+            "deleted": [
+                {"employee_id": tombstone.employee_id, "deleted_at": tombstone.deleted_at}
+                for tombstone in deleted
+            ],
+            "next_token": encode_sync_token(next_changes, next_tombstones),
+            "has_more": more_changes or more_tombstones,
+        }
+
     async def search_employees(self, search_term: str, limit:int = 10) -> List[EmployeeListResponseDto]:
         query = EmployeeQueryDto(
             search=search_term,
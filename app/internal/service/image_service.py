@@ -0,0 +1,74 @@
+import asyncio
+import importlib.util
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from fastapi import HTTPException, status
+from app.internal.config.settings import settings
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    # Process pool dibuat sekali per worker, decode/resize berat di CPU
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_PROCESS_WORKERS)
+    return _executor
+
+
+def shutdown_image_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def render_variants(content: bytes, sizes: List[int], quality: int) -> Dict[int, bytes]:
+    # Jalan di dalam process pool, jangan akses state aplikasi dari sini
+    from PIL import Image, ImageOps
+
+    largest = max(sizes)
+    with Image.open(io.BytesIO(content)) as img:
+        # JPEG bisa di-decode langsung di resolusi kecil, jauh lebih cepat
+        img.draft("RGB", (largest * 2, largest * 2))
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+        variants = {}
+        for size in sorted(set(sizes), reverse=True):
+            thumb = ImageOps.fit(img, (size, size), method=Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            thumb.save(buffer, format="WEBP", quality=quality, method=4)
+            variants[size] = buffer.getvalue()
+            # Resize berikutnya dari hasil yang sudah kecil
+            img = thumb
+    return variants
+
+
+class ImageService:
+    def __init__(self, sizes: Optional[List[int]] = None, quality: Optional[int] = None):
+        self.sizes = sizes or settings.PHOTO_VARIANT_SIZES
+        self.quality = quality or settings.PHOTO_WEBP_QUALITY
+
+    @staticmethod
+    def is_available() -> bool:
+        return importlib.util.find_spec("PIL") is not None
+
+    async def create_variants(self, content: bytes) -> Dict[int, bytes]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                get_image_executor(),
+                render_variants,
+                content,
+                self.sizes,
+                self.quality
+            )
+        except (OSError, ValueError) as e:
+            # PIL.UnidentifiedImageError turunan OSError
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid image file: {str(e)}"
+            )
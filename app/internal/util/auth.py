@@ -1,23 +1,58 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-import jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.domain.user_model import User, UserRole
 from app.internal.config.settings import settings
+from app.internal.util.metrics import BCRYPT_DURATION, BCRYPT_QUEUE_DEPTH
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    # passlib + bcrypt baru di-import saat login pertama, bukan saat boot
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+_bcrypt_in_flight = 0
+
+@lru_cache(maxsize=None)
+def get_bcrypt_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=settings.BCRYPT_POOL_SIZE, thread_name_prefix="bcrypt")
+
+def _update_bcrypt_queue_depth() -> None:
+    BCRYPT_QUEUE_DEPTH.set(max(0, _bcrypt_in_flight - settings.BCRYPT_POOL_SIZE))
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    # bcrypt sengaja lambat (~100ms+), jalankan di pool terpisah dari event loop
+    global _bcrypt_in_flight
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    _bcrypt_in_flight += 1
+    _update_bcrypt_queue_depth()
+    try:
+        return await loop.run_in_executor(
+            get_bcrypt_executor(), verify_password, plain_password, hashed_password
+        )
+    finally:
+        _bcrypt_in_flight -= 1
+        _update_bcrypt_queue_depth()
+        BCRYPT_DURATION.observe(time.perf_counter() - start)
 
 def get_password_hash(password: str) -> str :
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None ):
+    import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -29,12 +64,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None ):
     return encode_jwt
 
 def verify_token(token: str) -> dict:
+    import jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         return payload
-    except jwt.PyJWKError:
+    except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,254 @@
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from app.internal.config.settings import settings
+from app.internal.util.metrics import CACHE_REQUESTS, CACHE_STALE_SERVED
+from app.internal.util.deadline import deadline_for
+from app.internal.util.request_context import RequestContext, get_request_context, set_request_context
+
+logger = logging.getLogger(__name__)
+
+# Cache dua tingkat:
+#   L1  LRU per proses, isi sudah di-decode, tanpa I/O
+#   L2  shared antar worker (Redis kalau CACHE_REDIS_URL di-set, selain itu
+#       stand-in lokal per proses), isi JSON bytes
+# Nilai yang disimpan harus JSON-able (hasil model_dump(mode="json")).
+# Invalidasi dari repository write disebar ke worker lain lewat Postgres
+# LISTEN/NOTIFY (lihat app.internal.connection.cache_invalidation).
+#
+# get_or_load menambah stale-while-revalidate: setelah `ttl` habis entry masih
+# disajikan (dengan header Warning) sampai CACHE_MAX_STALE_SECONDS sambil satu
+# refresh jalan di background. Kalau DB mati, read tetap dilayani selama itu.
+
+STALE_WARNING = '110 - "Response is Stale"'
+REVALIDATION_FAILED_WARNING = '111 - "Revalidation Failed"'
+
+DEPARTMENTS_CACHE_KEY = "employee:departments"
+STATISTICS_CACHE_KEY = "employee:statistics"
+# Versi koleksi employee untuk ETag list/data referensi
+COLLECTION_VERSION_CACHE_KEY = "employee:version"
+REFERENCE_CACHE_KEYS = (DEPARTMENTS_CACHE_KEY, STATISTICS_CACHE_KEY, COLLECTION_VERSION_CACHE_KEY)
+
+
+def employee_key(employee_id: str) -> str:
+    return f"employee:{employee_id}"
+
+
+def user_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+class LRUCache:
+    # L1: OrderedDict sebagai LRU, tiap entry punya expiry sendiri
+    def __init__(self, max_entries: int, ttl: float, name: str = "default"):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.name = name
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class LocalBackend:
+    # Stand-in L2 tanpa Redis (test, single worker). Tidak shared antar
+    # proses, jadi ikut dibersihkan saat menerima NOTIFY.
+    shared = False
+
+    def __init__(self):
+        self._data = LRUCache(max_entries=settings.CACHE_L1_MAX_ENTRIES, ttl=settings.CACHE_L2_TTL_SECONDS)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self._data.invalidate(*keys)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend:
+    # L2 shared lewat protokol Redis (redis-py asyncio, opsional)
+    shared = True
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.prefix = settings.CACHE_KEY_PREFIX
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self) -> None:
+        # Hanya L1 yang dibersihkan saat reconnect listener; L2 shared dibiarkan
+        pass
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class TwoTierCache:
+    def __init__(self, l1: LRUCache, l2=None, name: str = "default"):
+        self.l1 = l1
+        self.l2 = l2 if l2 is not None else LocalBackend()
+        self.name = name
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._refresh_failed: Set[str] = set()
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.l1.get(key)
+        if value is not None:
+            CACHE_REQUESTS.inc(cache=self.name, result="l1_hit")
+            return value
+
+        try:
+            raw = await self.l2.get(key)
+        except Exception:
+            # L2 mati tidak boleh bikin request gagal, anggap miss
+            raw = None
+        if raw is None:
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return None
+
+        value = json.loads(raw)
+        self.l1.set(key, value)
+        CACHE_REQUESTS.inc(cache=self.name, result="l2_hit")
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.l1.set(key, value, ttl)
+        try:
+            await self.l2.set(key, json.dumps(value).encode(), ttl or settings.CACHE_L2_TTL_SECONDS)
+        except Exception:
+            pass
+
+    async def invalidate(self, *keys: str) -> None:
+        # Dipanggil worker yang menulis: L1 sendiri + L2 shared
+        self.l1.invalidate(*keys)
+        try:
+            await self.l2.delete(*keys)
+        except Exception:
+            pass
+
+    async def invalidate_local(self, *keys: str) -> None:
+        # Dipanggil dari NOTIFY worker lain: L2 shared sudah dihapus pengirim
+        self.l1.invalidate(*keys)
+        if not self.l2.shared:
+            await self.l2.delete(*keys)
+
+    async def clear_local(self) -> None:
+        self.l1.clear()
+        await self.l2.clear()
+
+    async def close(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.l2.close()
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+    ) -> Optional[Any]:
+        # loader mengembalikan nilai JSON-able, None berarti tidak ada (tidak di-cache)
+        entry = await self.get(key)
+        if entry is not None:
+            now = time.time()
+            if now < entry["fresh_until"]:
+                return entry["value"]
+            if now < entry["stale_until"]:
+                self._serve_stale(key, loader, ttl)
+                return entry["value"]
+
+        value = await loader()
+        if value is not None:
+            await self._store(key, value, ttl)
+        return value
+
+    async def _store(self, key: str, value: Any, ttl: float) -> None:
+        # Waktu wall-clock (bukan monotonic) karena entry dibaca worker lain lewat L2
+        now = time.time()
+        max_stale = settings.CACHE_MAX_STALE_SECONDS
+        entry = {"value": value, "fresh_until": now + ttl, "stale_until": now + ttl + max_stale}
+        await self.set(key, entry, ttl + max_stale)
+
+    def _serve_stale(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> None:
+        failed = key in self._refresh_failed
+        CACHE_STALE_SERVED.inc(cache=self.name, reason="revalidation_failed" if failed else "revalidating")
+        context = get_request_context()
+        if context is not None:
+            context.add_warning(REVALIDATION_FAILED_WARNING if failed else STALE_WARNING)
+
+        if key not in self._refreshing:
+            # Context kosong: query refresh bukan milik request yang memicunya
+            task = contextvars.Context().run(asyncio.ensure_future, self._refresh(key, loader, ttl))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _, key=key: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> None:
+        # Refresh tetap dibatasi deadline default, jangan sampai menahan koneksi DB
+        set_request_context(RequestContext(deadline=deadline_for("GET", "")))
+        try:
+            value = await loader()
+        except Exception:
+            self._refresh_failed.add(key)
+            logger.warning("Background refresh of %s failed, serving stale value", key, exc_info=True)
+            return
+        self._refresh_failed.discard(key)
+        if value is None:
+            await self.invalidate(key)
+        else:
+            await self._store(key, value, ttl)
+
+
+def build_l2_backend():
+    if settings.CACHE_REDIS_URL:
+        return RedisBackend(settings.CACHE_REDIS_URL)
+    return LocalBackend()
+
+
+shared_cache = TwoTierCache(
+    LRUCache(max_entries=settings.CACHE_L1_MAX_ENTRIES, ttl=settings.CACHE_L1_TTL_SECONDS),
+    build_l2_backend(),
+    name="shared",
+)
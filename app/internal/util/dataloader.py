@@ -0,0 +1,119 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, TypeVar
+from app.internal.config.settings import settings
+from app.internal.util.metrics import DATALOADER_BATCH_SIZE
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFn = Callable[[List[K]], Awaitable[Dict[K, V]]]
+
+
+class Batcher(Generic[K, V]):
+    # Satu instance per proses per jenis data. Key yang diminta selama satu
+    # iterasi event loop, dari request mana pun, di-resolve dengan satu
+    # panggilan batch_fn(keys) -> {key: value} (satu query IN). Antrean dipisah
+    # per `group`: request yang wajib membaca dari primary tidak boleh ikut
+    # batch yang dibaca dari replica. batch_fn dan context (deadline, catatan
+    # query) yang dipakai adalah milik caller pertama di batch itu.
+    # Key yang tidak ada di hasil batch di-resolve ke None.
+
+    def __init__(self, name: str, max_batch_size: Optional[int] = None):
+        self.name = name
+        self.max_batch_size = max_batch_size or settings.DATALOADER_MAX_BATCH_SIZE
+        self._queues: Dict[Hashable, Dict[K, asyncio.Future]] = {}
+        self._batch_fns: Dict[Hashable, BatchFn] = {}
+
+    def load(self, key: K, group: Hashable, batch_fn: BatchFn) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(group)
+        if queue is None:
+            queue = self._queues[group] = {}
+            self._batch_fns[group] = batch_fn
+            # Dispatch setelah callback lain di iterasi ini sempat ikut load()
+            loop.call_soon(self._dispatch, group)
+        future = queue.get(key)
+        if future is None:
+            future = queue[key] = loop.create_future()
+        return future
+
+    def _dispatch(self, group: Hashable) -> None:
+        queue = self._queues.pop(group)
+        batch_fn = self._batch_fns.pop(group)
+        keys = list(queue)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = keys[start:start + self.max_batch_size]
+            asyncio.ensure_future(self._resolve(batch_fn, {key: queue[key] for key in chunk}))
+
+    async def _resolve(self, batch_fn: BatchFn, futures: Dict[K, asyncio.Future]) -> None:
+        DATALOADER_BATCH_SIZE.observe(len(futures), loader=self.name)
+        try:
+            results = await batch_fn(list(futures))
+        except BaseException as exc:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(exc)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            return
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+def read_group(repository) -> Hashable:
+    # Group Batcher untuk repository: backend dan sumber baca (replica atau
+    # primary, lihat DbSession.prefers_replica) harus sama dalam satu batch
+    db = getattr(repository, "db", None)
+    return type(repository), getattr(db, "prefers_replica", True)
+
+
+class DataLoader(Generic[K, V]):
+    # Cache hasil per request di atas Batcher proses: key yang sama tidak
+    # di-query dua kali dalam satu request, dan write di request itu cukup
+    # clear() key-nya. Instance dibuat per request (di service).
+
+    def __init__(
+        self,
+        batcher: Batcher[K, V],
+        batch_fn: BatchFn,
+        group: Callable[[], Hashable] = lambda: None,
+    ):
+        self.batcher = batcher
+        self.batch_fn = batch_fn
+        self.group = group
+        self._results: Dict[K, asyncio.Future] = {}
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._results.get(key)
+        if future is None:
+            future = self._results[key] = self.batcher.load(key, self.group(), self.batch_fn)
+            future.add_done_callback(lambda done, key=key: self._forget_failed(key, done))
+        # shield: caller yang batal tidak membatalkan hasil untuk caller lain
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: Optional[V]) -> None:
+        future = self._results.get(key)
+        if future is None or future.done():
+            future = self._results[key] = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+
+    def clear(self, key: K) -> None:
+        # Dipanggil setelah write supaya load berikutnya membaca data baru
+        future = self._results.get(key)
+        if future is not None and future.done():
+            del self._results[key]
+
+    def _forget_failed(self, key: K, future: asyncio.Future) -> None:
+        # Gagal tidak di-cache, load berikutnya boleh mencoba lagi. exception()
+        # juga menandai error sudah diambil walau semua caller sudah batal.
+        if future.cancelled() or future.exception() is not None:
+            if self._results.get(key) is future:
+                del self._results[key]
+
+
+employee_batcher: Batcher = Batcher("employees")
+user_batcher: Batcher = Batcher("users")
@@ -0,0 +1,35 @@
+import time
+from typing import Optional
+from fastapi import HTTPException, status
+from app.internal.config.settings import settings
+from app.internal.util.request_context import get_request_context
+from app.internal.util.route_rules import RouteRules
+
+# Deadline DB per request: dihitung dari awal request, semua query di request
+# itu berbagi sisa waktunya. Lewat deadline, query dibatalkan dan client dapat 504.
+
+route_deadlines: RouteRules[float] = RouteRules(settings.DB_DEADLINES_MS)
+
+
+class DeadlineExceeded(HTTPException):
+    def __init__(self, detail: str = "Database deadline exceeded"):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail)
+
+
+def deadline_for(method: str, path: str) -> Optional[float]:
+    # Deadline absolut (time.perf_counter), None kalau tidak dibatasi
+    deadline_ms = route_deadlines.match(method, path, settings.DB_DEADLINE_DEFAULT_MS)
+    if not deadline_ms:
+        return None
+    return time.perf_counter() + deadline_ms / 1000
+
+
+def remaining_time() -> Optional[float]:
+    # Sisa waktu untuk query berikutnya; raise kalau deadline sudah lewat
+    context = get_request_context()
+    if context is None or context.deadline is None:
+        return None
+    remaining = context.deadline - time.perf_counter()
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    return remaining
@@ -1,15 +1,34 @@
 # app/internal/util/dependencies.py
-from fastapi import Depends
+from typing import TYPE_CHECKING
+from fastapi import Depends, FastAPI
 from fastapi.security import HTTPAuthorizationCredentials
 from app.internal.service.auth_service import AuthService
 from app.internal.repository.auth_repo import AuthRepository
-from app.internal.connection.prisma import get_db
+from app.internal.repository.pg_auth_repo import PgAuthRepository
+from app.internal.repository.employee_repo import EmployeeRepository
+from app.internal.repository.pg_employee_repo import PgEmployeeRepository
+from app.internal.connection.asyncpg_pool import get_pg_pool
+from app.internal.connection.prisma import DbSession, get_db_session
 from app.internal.util.auth import security
 from app.domain.user_model import User
-from prisma import Prisma
 
-def get_auth_service(db: Prisma = Depends(get_db)) -> AuthService:
-    auth_repo = AuthRepository(db)
+if TYPE_CHECKING:
+    from app.internal.repository.memory_repo import InMemoryStore
+
+def get_auth_repository(db: DbSession = Depends(get_db_session)) -> AuthRepository:
+    return PgAuthRepository(db) if get_pg_pool() else AuthRepository(db)
+
+def get_employee_repository(db: DbSession = Depends(get_db_session)) -> EmployeeRepository:
+    return PgEmployeeRepository(db) if get_pg_pool() else EmployeeRepository(db)
+
+def use_in_memory_repositories(app: FastAPI, store: "InMemoryStore") -> None:
+    # Swap backend Prisma ke in-memory lewat dependency override (benchmark/test tanpa DB)
+    from app.internal.repository.memory_repo import InMemoryEmployeeRepository, InMemoryAuthRepository
+
+    app.dependency_overrides[get_employee_repository] = lambda: InMemoryEmployeeRepository(store)
+    app.dependency_overrides[get_auth_repository] = lambda: InMemoryAuthRepository(store)
+
+def get_auth_service(auth_repo: AuthRepository = Depends(get_auth_repository)) -> AuthService:
     return AuthService(auth_repo)
 
 async def get_current_user(
@@ -0,0 +1,70 @@
+import hashlib
+import time
+import uuid
+from contextlib import nullcontext
+from typing import NamedTuple
+from fastapi import Request, Response
+from app.internal.config.settings import settings
+from app.internal.connection.prisma import primary_reads
+from app.internal.util.cache import COLLECTION_VERSION_CACHE_KEY, shared_cache
+
+# ETag lemah (W/) untuk conditional GET. Record tunggal: dari employee_id +
+# updated_at. List dan data referensi: dari versi koleksi, token acak yang
+# ikut di-invalidate setiap write employee (lihat REFERENCE_CACHE_KEYS), jadi
+# If-None-Match bisa dijawab 304 tanpa query DB.
+# Versi baru dibuat tepat setelah write, saat replica mungkin belum melihatnya:
+# body untuk versi yang masih muda dibaca dari primary (CollectionVersion.reads).
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.blake2b(":".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def employee_etag(employee_id: str, updated_at: object) -> str:
+    return make_etag("employee", employee_id, updated_at)
+
+
+class CollectionVersion(NamedTuple):
+    tag: str
+    created_at: float
+
+    def reads(self):
+        # Context untuk membaca body yang diberi ETag versi ini
+        if time.time() - self.created_at < settings.DB_REPLICA_MAX_LAG_SECONDS:
+            return primary_reads()
+        return nullcontext()
+
+
+async def collection_version() -> CollectionVersion:
+    # Harus diambil SEBELUM data dibaca: write sesudahnya mengganti versi,
+    # jadi ETag tidak pernah menempel ke data yang lebih lama dari versinya
+    entry = await shared_cache.get(COLLECTION_VERSION_CACHE_KEY)
+    if not isinstance(entry, dict):
+        # created_at wall-clock: entry dibaca worker lain lewat L2
+        entry = {"tag": uuid.uuid4().hex, "created_at": time.time()}
+        await shared_cache.set(COLLECTION_VERSION_CACHE_KEY, entry, settings.CACHE_L2_TTL_SECONDS)
+    return CollectionVersion(entry["tag"], entry["created_at"])
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    # Perbandingan lemah (RFC 9110): prefix W/ diabaikan
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return any((candidate[2:] if candidate.startswith("W/") else candidate) == opaque for candidate in candidates)
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+from app.internal.config.settings import settings
+from app.internal.connection import pg_listener
+from app.internal.util.metrics import EVENT_BUS_DROPPED, EVENT_BUS_PUBLISHED, EVENT_BUS_SUBSCRIBERS
+
+logger = logging.getLogger(__name__)
+
+# Event perubahan employee untuk stream SSE. Publish mengirim ke subscriber di
+# worker ini lalu NOTIFY ke worker lain; event dari NOTIFY hanya dikirim lokal.
+# Event harus kecil (payload NOTIFY maksimal 8000 byte): id + delta, bukan record.
+
+
+class Subscription:
+    # Satu per koneksi SSE. Queue dibatasi: client lambat tidak boleh menahan
+    # memori tanpa batas. Kalau penuh, event dibuang dan client diberi tahu
+    # lewat event "resync" supaya memuat ulang lewat delta sync.
+
+    def __init__(self, max_size: int):
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            EVENT_BUS_DROPPED.inc()
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        # None kalau tidak ada event sampai timeout (saatnya heartbeat)
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    def __init__(self):
+        self.subscribers: Set[Subscription] = set()
+
+    def subscribe(self) -> Optional[Subscription]:
+        # None kalau worker ini sudah melayani SSE_MAX_SUBSCRIBERS koneksi
+        if len(self.subscribers) >= settings.SSE_MAX_SUBSCRIBERS:
+            return None
+        subscription = Subscription(settings.SSE_QUEUE_SIZE)
+        self.subscribers.add(subscription)
+        EVENT_BUS_SUBSCRIBERS.set(len(self.subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+        EVENT_BUS_SUBSCRIBERS.set(len(self.subscribers))
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        for subscription in self.subscribers:
+            subscription.offer(event)
+
+    async def publish(self, event_type: str, **data: Any) -> None:
+        event = {"type": event_type, "at": time.time(), **data}
+        EVENT_BUS_PUBLISHED.inc(type=event_type)
+        self.deliver(event)
+        if settings.EVENT_BUS_CHANNEL:
+            await pg_listener.notify(
+                settings.EVENT_BUS_CHANNEL,
+                json.dumps({"origin": pg_listener.instance_id(), "event": event}, default=str),
+            )
+
+    async def _apply_notification(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed event bus payload")
+            return
+        if message.get("origin") == pg_listener.instance_id():
+            return
+        self.deliver(message["event"])
+
+    async def _on_reconnect(self) -> None:
+        # Event dari worker lain selama koneksi putus hilang
+        for subscription in self.subscribers:
+            subscription.overflowed = True
+
+
+event_bus = EventBus()
+
+
+def register_event_listener() -> None:
+    if settings.EVENT_BUS_CHANNEL:
+        pg_listener.register(settings.EVENT_BUS_CHANNEL, event_bus._apply_notification, event_bus._on_reconnect)
+
+
+def format_sse(event_type: str, data: Any) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from app.internal.config.settings import settings
+from app.internal.util.metrics import LOG_RECORDS_DROPPED
+
+# Handler di thread request cuma memasukkan LogRecord ke queue. Format pesan
+# (record.getMessage), serialisasi JSON dan write ke stderr dikerjakan thread
+# QueueListener, jadi logging tidak ikut masuk ke latency request.
+
+# Atribut bawaan LogRecord, sisanya dianggap field `extra=` untuk output JSON
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    # Sampling per logger (prefix terpanjang menang), hanya untuk DEBUG/INFO.
+    # WARNING ke atas selalu lolos.
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: Dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, value in self.rates.items():
+                matches = name == prefix or name.startswith(prefix + ".")
+                if matches and len(prefix) > best:
+                    best, rate = len(prefix), value
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class AsyncQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler bawaan memformat pesan di thread pemanggil; di sini
+        # record dikirim apa adanya (queue in-process, tidak perlu pickle)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Lebih baik kehilangan log daripada request ikut menunggu
+            LOG_RECORDS_DROPPED.inc()
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[AsyncQueueHandler] = None
+
+
+def _build_stream_handler(json_output: bool) -> logging.Handler:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if json_output else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def configure_logging(force: bool = False) -> None:
+    global _listener, _handler
+
+    if _listener is not None and not force:
+        return
+    shutdown_logging()
+
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _handler = AsyncQueueHandler(log_queue)
+    if settings.LOG_SAMPLE_RATES:
+        _handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = QueueListener(log_queue, _build_stream_handler(settings.LOG_JSON))
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    # Flush sisa record di queue sebelum proses keluar
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _stop_before_fork() -> None:
+    # Thread listener dihentikan (dan queue di-flush) sebelum fork: kalau fork
+    # terjadi saat thread itu memegang lock queue atau stderr, lock tersebut
+    # terkunci selamanya di proses anak
+    if _listener is not None:
+        _listener.stop()
+
+
+def _start_after_fork() -> None:
+    # Parent dan worker masing-masing menjalankan thread listener sendiri
+    if _listener is not None:
+        _listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_stop_before_fork,
+        after_in_parent=_start_after_fork,
+        after_in_child=_start_after_fork,
+    )
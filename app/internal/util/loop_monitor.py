@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+from app.internal.config.settings import settings
+from app.internal.util.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingWatchdog(threading.Thread):
+    # Thread terpisah yang mengawasi heartbeat dari event loop. Kalau loop
+    # tidak bangun tepat waktu lebih dari threshold, berarti ada satu step
+    # coroutine yang blocking: stack thread loop di-dump saat itu juga,
+    # jadi yang tercetak adalah kode pelakunya, bukan korban berikutnya.
+    # Metrics tidak thread-safe: thread ini hanya menghitung `stalls`, yang
+    # dipublikasikan dari event loop oleh monitor_loop_lag.
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int, threshold: float):
+        super().__init__(name="loop-watchdog", daemon=True)
+        self.loop = loop
+        self.loop_thread_id = loop_thread_id
+        self.threshold = threshold
+        self.deadline = time.monotonic()
+        self._reported_deadline: Optional[float] = None
+        self.stalls = 0
+        self._stop_event = threading.Event()
+
+    def beat(self, next_wakeup: float) -> None:
+        self.deadline = next_wakeup
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        poll_interval = max(self.threshold / 4, 0.01)
+        while not self._stop_event.wait(poll_interval):
+            deadline = self.deadline
+            blocked_for = time.monotonic() - deadline
+            if blocked_for < self.threshold or self._reported_deadline == deadline:
+                continue
+            # Satu stall cukup di-report sekali
+            self._reported_deadline = deadline
+            self.report(blocked_for)
+
+    def report(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return
+        task = asyncio.current_task(self.loop)
+        self.stalls += 1
+        logger.warning(
+            "Event loop blocked for %.0f ms in task %s\n%s",
+            blocked_for * 1000,
+            task.get_name() if task else "<no task>",
+            "".join(traceback.format_stack(frame)),
+        )
+
+
+async def monitor_loop_lag(
+    interval: Optional[float] = None,
+    threshold_ms: Optional[float] = None,
+    debug: Optional[bool] = None,
+) -> None:
+    # Lag = seberapa telat sleep(interval) bangun dari jadwalnya. Loop yang sehat
+    # lag-nya mendekati nol, lag besar berarti callback lain memonopoli loop.
+    interval = interval if interval is not None else settings.LOOP_LAG_SAMPLE_INTERVAL_SECONDS
+    threshold_ms = threshold_ms if threshold_ms is not None else settings.LOOP_BLOCK_THRESHOLD_MS
+    debug = debug if debug is not None else settings.DEBUG
+
+    watchdog = None
+    published_stalls = 0
+    if debug:
+        watchdog = BlockingWatchdog(
+            asyncio.get_running_loop(), threading.get_ident(), threshold_ms / 1000
+        )
+        watchdog.start()
+
+    try:
+        while True:
+            scheduled = time.monotonic() + interval
+            if watchdog:
+                watchdog.beat(scheduled)
+            await asyncio.sleep(interval)
+            EVENT_LOOP_LAG.observe(max(time.monotonic() - scheduled, 0.0))
+            if watchdog and watchdog.stalls != published_stalls:
+                stalls = watchdog.stalls
+                EVENT_LOOP_BLOCKED.inc(stalls - published_stalls)
+                published_stalls = stalls
+    finally:
+        if watchdog:
+            watchdog.stop()
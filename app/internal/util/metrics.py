@@ -0,0 +1,375 @@
+import glob
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from app.internal.config.settings import settings
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Semua update metric terjadi di thread event loop worker itu sendiri, jadi
+# tidak butuh lock. Agregasi antar worker uvicorn lewat snapshot file JSON
+# per pid di METRICS_MULTIPROC_DIR, digabung saat /metrics di-scrape.
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def snapshot(self) -> Dict:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> Dict:
+        return {"values": [[list(key), value] for key, value in self._values.items()]}
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def snapshot(self) -> Dict:
+        return {"values": [[list(key), value] for key, value in self._values.items()]}
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label: [count per bucket..., count +Inf, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-1] += value
+
+    def snapshot(self) -> Dict:
+        return {
+            "buckets": list(self.buckets),
+            "values": [[list(key), series] for key, series in self._values.items()],
+        }
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict:
+        return {
+            name: {
+                "kind": metric.kind,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                **metric.snapshot(),
+            }
+            for name, metric in self._metrics.items()
+        }
+
+
+registry = Registry()
+
+
+# Snapshot multiprocess
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics_{pid}.json")
+
+
+def write_snapshot(snapshot: Optional[Dict] = None, directory: Optional[str] = None) -> None:
+    # snapshot diambil di thread event loop, penulisan file boleh di thread lain
+    directory = directory or settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    data = json.dumps({"pid": os.getpid(), "metrics": snapshot or registry.snapshot()})
+    # Tulis ke file sementara lalu rename, scraper tidak pernah baca file setengah jadi
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics_")
+    with os.fdopen(fd, "w") as f:
+        f.write(data)
+    os.replace(tmp_path, _snapshot_path(directory, os.getpid()))
+
+
+def clear_snapshots(directory: Optional[str] = None) -> None:
+    directory = directory or settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+        os.remove(path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def load_snapshots(snapshot: Optional[Dict] = None, directory: Optional[str] = None) -> List[Dict]:
+    directory = directory or settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return [{"pid": os.getpid(), "metrics": snapshot or registry.snapshot()}]
+
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def merge_snapshots(snapshots: Iterable[Dict]) -> Dict:
+    # Counter dan histogram dijumlah dari semua worker (termasuk yang sudah mati,
+    # supaya tetap monoton). Gauge hanya dari worker yang masih hidup.
+    merged: Dict[str, Dict] = {}
+    for snapshot in snapshots:
+        alive = _pid_alive(snapshot["pid"])
+        for name, metric in snapshot["metrics"].items():
+            if metric["kind"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**metric, "values": {}})
+            for labels, value in metric["values"]:
+                key = tuple(labels)
+                if metric["kind"] == "histogram":
+                    current = target["values"].get(key)
+                    target["values"][key] = (
+                        [a + b for a, b in zip(current, value)] if current else list(value)
+                    )
+                else:
+                    target["values"][key] = target["values"].get(key, 0.0) + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(merged: Dict) -> str:
+    lines = []
+    for name in sorted(merged):
+        metric = merged[name]
+        labelnames = metric["labelnames"]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        for key, value in sorted(metric["values"].items()):
+            if metric["kind"] == "histogram":
+                cumulative = 0.0
+                bounds = list(metric["buckets"]) + [float("inf")]
+                for bound, count in zip(bounds, value[:-1]):
+                    cumulative += count
+                    le = f'le="{_format_number(bound)}"'
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {_format_number(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_number(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labelnames, key)} {_format_number(cumulative)}")
+            else:
+                lines.append(f"{name}{_format_labels(labelnames, key)} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def render_latest(snapshot: Optional[Dict] = None) -> str:
+    snapshot = snapshot or registry.snapshot()
+    if settings.METRICS_MULTIPROC_DIR:
+        write_snapshot(snapshot)
+    return render(merge_snapshots(load_snapshots(snapshot)))
+
+
+async def flush_periodically() -> None:
+    # Snapshot worker ini ditulis berkala supaya scrape ke worker lain tetap lengkap
+    import asyncio
+    from starlette.concurrency import run_in_threadpool
+
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL_SECONDS)
+        await run_in_threadpool(write_snapshot, registry.snapshot())
+
+
+# Metric aplikasi
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ("method",),
+)
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds",
+    "Database query latency by model and action",
+    ("model", "action"),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (l1_hit/l2_hit/hit/miss)",
+    ("cache", "result"),
+)
+BCRYPT_QUEUE_DEPTH = registry.gauge(
+    "bcrypt_pool_queue_depth",
+    "Password hash verifications waiting for a bcrypt pool thread",
+)
+BCRYPT_DURATION = registry.histogram(
+    "bcrypt_verify_duration_seconds",
+    "Password verification latency including queue wait",
+)
+CLOUDINARY_DURATION = registry.histogram(
+    "cloudinary_request_duration_seconds",
+    "Cloudinary API call latency by operation",
+    ("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+EVENT_LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduled and actual wake-up of the loop lag probe",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+EVENT_LOOP_BLOCKED = registry.counter(
+    "event_loop_blocked_total",
+    "Loop stalls longer than LOOP_BLOCK_THRESHOLD_MS caught by the debug watchdog",
+)
+LOG_RECORDS_DROPPED = registry.counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+)
+SINGLEFLIGHT_CALLS = registry.counter(
+    "singleflight_calls_total",
+    "Coalesced calls by group, result=leader ran the query, result=shared reused it",
+    ("group", "result"),
+)
+CACHE_INVALIDATIONS = registry.counter(
+    "cache_invalidations_total",
+    "Cache keys invalidated, source=local from own writes, source=notify from other workers",
+    ("source",),
+)
+CACHE_STALE_SERVED = registry.counter(
+    "cache_stale_served_total",
+    "Stale cache entries served past their TTL, by cache and reason (revalidating/revalidation_failed)",
+    ("cache", "reason"),
+)
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "admission_in_flight",
+    "Requests admitted and running, by priority class",
+    ("priority",),
+)
+ADMISSION_QUEUE_WAIT = registry.histogram(
+    "admission_queue_wait_seconds",
+    "Time spent waiting for an admission slot, by priority class",
+    ("priority",),
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total",
+    "Requests shed with 503, by priority class and reason (queue_full/timeout)",
+    ("priority", "reason"),
+)
+DB_DEADLINE_EXCEEDED = registry.counter(
+    "db_deadline_exceeded_total",
+    "DB queries cancelled because the request deadline passed, by model and action",
+    ("model", "action"),
+)
+DATALOADER_BATCH_SIZE = registry.histogram(
+    "dataloader_batch_size",
+    "Keys resolved per DataLoader batch query, by loader",
+    ("loader",),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+EVENT_BUS_PUBLISHED = registry.counter(
+    "event_bus_published_total",
+    "Employee change events published by this worker, by type",
+    ("type",),
+)
+EVENT_BUS_DROPPED = registry.counter(
+    "event_bus_dropped_total",
+    "Events dropped because an SSE subscriber queue was full",
+)
+EVENT_BUS_SUBSCRIBERS = registry.gauge(
+    "event_bus_subscribers",
+    "Open SSE subscriptions on this worker",
+)
@@ -0,0 +1,58 @@
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class QueryRecord:
+    model: str
+    action: str
+    duration: float
+
+
+@dataclass
+class RequestContext:
+    # State per request, di-set oleh middleware dan diisi oleh layer di bawahnya
+    started_at: float = field(default_factory=time.perf_counter)
+    queries: List[QueryRecord] = field(default_factory=list)
+    # Header Warning untuk response (mis. data cache basi saat DB bermasalah)
+    warnings: List[str] = field(default_factory=list)
+    # Batas waktu query DB (time.perf_counter), None = tanpa batas
+    deadline: Optional[float] = None
+
+    @property
+    def query_count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_time(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def add_warning(self, warning: str) -> None:
+        if warning not in self.warnings:
+            self.warnings.append(warning)
+
+    def query_summary(self) -> str:
+        counts = Counter(f"{query.model}.{query.action}" for query in self.queries)
+        return ", ".join(f"{name} x{count}" for name, count in counts.most_common())
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    return _request_context.get()
+
+
+def set_request_context(context: RequestContext) -> Token:
+    return _request_context.set(context)
+
+
+def reset_request_context(token: Token) -> None:
+    _request_context.reset(token)
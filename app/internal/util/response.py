@@ -1,4 +1,5 @@
-from typing import Any, Optional
+from typing import Any, Optional, Union
+from fastapi.responses import JSONResponse
 from app.dto.response_dto import ResponseDTO
 
 def success_response(message: str, data: Any = None) -> dict:
@@ -9,10 +10,14 @@ def success_response(message: str, data: Any = None) -> dict:
         error=None
     ).model_dump()
 
-def error_response(message: str, error: str = None) -> dict:
-    return ResponseDTO(
+def error_response(message: str, error: str = None, status_code: Optional[int] = None) -> Union[dict, JSONResponse]:
+    body = ResponseDTO(
         success=False,
         message=message,
         data=None,
         error=error or message
-    ).model_dump()
\ No newline at end of file
+    ).model_dump()
+    # Dengan status_code dikembalikan sebagai response, bukan 200 berisi success=False
+    if status_code is None:
+        return body
+    return JSONResponse(status_code=status_code, content=body)
@@ -0,0 +1,29 @@
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RouteRules(Generic[T]):
+    # Pemetaan request -> nilai dari Settings (kelas admission, deadline, ...).
+    # Key "METHOD /path" atau "/path" dicocokkan exact, key yang diakhiri "/"
+    # dicocokkan sebagai prefix (prefix terpanjang menang). Dipakai sebelum
+    # routing FastAPI, jadi yang dicocokkan path asli, bukan template route.
+
+    def __init__(self, rules: Dict[str, T]):
+        self.exact: Dict[str, T] = {key: value for key, value in rules.items() if not key.endswith("/")}
+        self.prefixes: List[Tuple[str, T]] = sorted(
+            ((key, value) for key, value in rules.items() if key.endswith("/")),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def match(self, method: str, path: str, default: Optional[T] = None) -> Optional[T]:
+        value = self.exact.get(f"{method} {path}")
+        if value is None:
+            value = self.exact.get(path)
+        if value is not None:
+            return value
+        for prefix, value in self.prefixes:
+            if path.startswith(prefix):
+                return value
+        return default
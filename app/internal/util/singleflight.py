@@ -0,0 +1,40 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+from app.internal.util.metrics import SINGLEFLIGHT_CALLS
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    # Panggilan identik yang datang bersamaan cukup dijalankan sekali: caller
+    # pertama (leader) membuat task, caller berikutnya menunggu task yang sama.
+    # Per proses, key dilepas begitu task selesai (bukan cache).
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            SINGLEFLIGHT_CALLS.inc(group=self.name, result="leader")
+        else:
+            SINGLEFLIGHT_CALLS.inc(group=self.name, result="shared")
+        # shield: client yang disconnect tidak boleh membatalkan hasil untuk yang lain
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Exception yang tidak diambil siapa pun (semua caller batal) jangan jadi warning
+        if not task.cancelled():
+            task.exception()
+
+
+employee_reads = SingleFlight("employee_reads")
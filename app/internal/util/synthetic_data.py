@@ -0,0 +1,38 @@
+# Penamaan data sintetis: dipakai backend in-memory (populate) dan load test
+# (benchmarks/loadtest), jadi akun dan id yang dipakai driver sama di keduanya.
+# Sengaja tanpa import lain supaya driver load test tidak ikut memuat app.
+import uuid
+
+NAMESPACE = uuid.UUID("6f1c2b1e-4d0a-4e53-9a61-6c0ad2f0b7e4")
+
+HRD_USERNAME = "lt_hrd"
+# Bukan .local/.test: EmailStr (email-validator) menolak domain special-use
+EMAIL_DOMAIN = "loadtest.example.com"
+
+DEPARTMENTS = {
+    "Engineering": ["Software Engineer", "QA Engineer", "DevOps Engineer", "Engineering Manager"],
+    "Finance": ["Accountant", "Finance Analyst", "Tax Specialist"],
+    "Human Resources": ["HR Generalist", "Recruiter", "HR Manager"],
+    "Operations": ["Operations Staff", "Supervisor", "Logistics Coordinator"],
+    "Sales": ["Account Executive", "Sales Manager", "Sales Admin"],
+    "Marketing": ["Content Writer", "Digital Marketer", "Designer"],
+}
+FIRST_NAMES = ["Budi", "Siti", "Agus", "Dewi", "Rizky", "Putri", "Andi", "Rina", "Fajar", "Intan", "Yoga", "Maya"]
+LAST_NAMES = ["Santoso", "Wijaya", "Pratama", "Lestari", "Saputra", "Hidayat", "Kusuma", "Nugroho", "Permata"]
+
+
+def stable_id(kind: str, index: int) -> str:
+    return str(uuid.uuid5(NAMESPACE, f"{kind}-{index}"))
+
+
+def employee_id(index: int) -> str:
+    return stable_id("employee", index)
+
+
+def employee_username(index: int) -> str:
+    # LoginRequestDTO membatasi username maksimal 20 karakter
+    return f"lt_user_{index:07d}"
+
+
+def email_for(username: str) -> str:
+    return f"{username}@{EMAIL_DOMAIN}"
@@ -0,0 +1,51 @@
+import logging
+from fastapi import FastAPI
+from app.dto import auth_dto, employee_dto, response_dto
+from app.domain import employe_model, user_model
+from app.dto.auth_dto import LoginResponseDTO, UserProfileDTO
+from app.dto.response_dto import ResponseDTO
+from app.internal.connection.prisma import DbSession, prisma, replica
+from app.internal.service.employee_service import EmployeeService
+from app.internal.util.dependency import get_employee_repository
+
+logger = logging.getLogger(__name__)
+
+MODEL_MODULES = (auth_dto, employee_dto, response_dto, employe_model, user_model)
+
+# Parametrisasi generic yang dibuat route saat request
+GENERIC_MODELS = (
+    ResponseDTO[LoginResponseDTO],
+    ResponseDTO[UserProfileDTO],
+    ResponseDTO[list],
+)
+
+
+def prebuild_models() -> None:
+    # Validator/serializer pydantic yang ditunda dibangun sekarang, bukan di request pertama
+    from pydantic import BaseModel
+
+    for module in MODEL_MODULES:
+        for value in vars(module).values():
+            if isinstance(value, type) and issubclass(value, BaseModel) and value.__module__ == module.__name__:
+                value.model_rebuild(force=True)
+    for model in GENERIC_MODELS:
+        model.model_rebuild(force=True)
+
+
+async def prime_reference_data(app: FastAPI) -> None:
+    override = app.dependency_overrides.get(get_employee_repository)
+    repository = override() if override else get_employee_repository(DbSession(prisma, replica))
+    service = EmployeeService(repository)
+    await service.get_departments()
+    await service.get_employee_statistics()
+
+
+async def warm_up(app: FastAPI) -> None:
+    try:
+        prebuild_models()
+        await prime_reference_data(app)
+        app.openapi()
+    except Exception:
+        # Warm-up gagal tidak boleh bikin worker mati, cukup lebih lambat di awal
+        logger.exception("Warm-up failed, serving cold")
+    app.state.ready = True
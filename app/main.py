@@ -1,14 +1,78 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
-from app.internal.api import auth_route, employee_route
-from app.internal.connection.prisma import db, connect_db, disconnect_db
+from contextlib import asynccontextmanager, suppress
+from app.internal.api import auth_route, employee_route, health_route, metrics_route
+from app.internal.connection.prisma import connect_db, disconnect_db
+from app.internal.connection.asyncpg_pool import connect_pg, disconnect_pg
+from app.internal.connection.cache_invalidation import register_invalidation_listener
+from app.internal.connection.pg_listener import start_listener, stop_listener
+from app.internal.config.settings import settings
+from app.internal.middleware.admission_middleware import AdmissionControlMiddleware
+from app.internal.middleware.compression_middleware import CompressionMiddleware
+from app.internal.middleware.metrics_middleware import MetricsMiddleware
+from app.internal.middleware.query_timing_middleware import QueryTimingMiddleware
+from app.internal.service.image_service import shutdown_image_executor
+from app.internal.util.cache import shared_cache
+from app.internal.util.dependency import use_in_memory_repositories
+from app.internal.util.event_bus import register_event_listener
+from app.internal.util.log import configure_logging, shutdown_logging
+from app.internal.util.loop_monitor import monitor_loop_lag
+from app.internal.util.metrics import flush_periodically, write_snapshot
+from app.internal.util.warmup import warm_up
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+    app.state.ready = False
+    in_memory = settings.REPOSITORY_BACKEND == "memory"
+    if in_memory:
+        # Backend benchmark/test, tidak di-import di deployment biasa
+        from app.internal.repository.memory_repo import InMemoryStore, populate
+        from app.internal.util.auth import get_password_hash
+
+        store = InMemoryStore()
+        populate(store, settings.MEMORY_SEED_EMPLOYEES, get_password_hash(settings.MEMORY_SEED_PASSWORD))
+        use_in_memory_repositories(app, store)
+    else:
+        await connect_db()
+        await connect_pg()
+        register_invalidation_listener()
+        register_event_listener()
+        await start_listener()
+
+    # Warm-up jalan di background, /health/ready baru 200 setelah selesai
+    warmup_task = asyncio.create_task(warm_up(app))
+    background_tasks = [warmup_task, asyncio.create_task(monitor_loop_lag())]
+    if settings.METRICS_MULTIPROC_DIR:
+        background_tasks.append(asyncio.create_task(flush_periodically()))
+    yield
+
+    app.state.ready = False
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    write_snapshot()
+    await stop_listener()
+    await shared_cache.close()
+    await disconnect_pg()
+    await disconnect_db()
+    shutdown_image_executor()
+    shutdown_logging()
 
 app = FastAPI(
     title="Payroll Management System",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+app.add_middleware(QueryTimingMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(AdmissionControlMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Paling luar (ditambahkan terakhir): preflight OPTIONS dijawab tanpa memakai
+# slot admission, dan 503/504 dari middleware di dalamnya tetap ber-header CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -17,17 +81,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(health_route.router)
+app.include_router(metrics_route.router)
 app.include_router(auth_route.router)
 app.include_router(employee_route.router)
 
-@app.on_event("startup")
-async def startup():
-    await connect_db()
-
-@app.on_event("shutdown")
-async def shutdown():
-    await disconnect_db()
-
 @app.get("/")
 async def root():
     return {"message": "Awesome it works 🐻"}
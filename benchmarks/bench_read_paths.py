@@ -0,0 +1,106 @@
+# Bandingkan latency read path panas: Prisma vs asyncpg fast path.
+#
+#   python -m benchmarks.bench_read_paths --iterations 500 --json result.json
+#
+# Butuh DATABASE_URL yang sudah berisi data (seed dengan benchmarks.loadtest.seed).
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from app.internal.config.settings import settings
+from app.internal.connection import asyncpg_pool
+from app.internal.connection.prisma import DbSession, connect_db, disconnect_db, prisma
+from app.internal.repository.auth_repo import AuthRepository
+from app.internal.repository.employee_repo import EmployeeRepository
+from app.internal.repository.pg_auth_repo import PgAuthRepository
+from app.internal.repository.pg_employee_repo import PgEmployeeRepository
+from app.dto.employee_dto import EmployeeQueryDto
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def measure(call: Callable[[], Awaitable], iterations: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        await call()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+async def run(iterations: int, warmup: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    settings.ASYNCPG_ENABLED = True
+    await connect_db()
+    await asyncpg_pool.connect_pg()
+    if asyncpg_pool.get_pg_pool() is None:
+        raise SystemExit("asyncpg is not installed")
+
+    try:
+        session = DbSession(prisma)
+        employee = await prisma.employees.find_first()
+        user = await prisma.users.find_first()
+        if not employee or not user:
+            raise SystemExit("Database is empty, seed it first")
+
+        list_query = EmployeeQueryDto(page=1, limit=20)
+        search_query = EmployeeQueryDto(search=employee.full_name[:3], limit=10, is_active=True)
+
+        implementations = {
+            "prisma": (EmployeeRepository(session), AuthRepository(session)),
+            "asyncpg": (PgEmployeeRepository(session), PgAuthRepository(session)),
+        }
+
+        results = {}
+        for name, (employee_repo, auth_repo) in implementations.items():
+            cases = {
+                "principal_lookup": lambda r=auth_repo: r.get_user_by_id(user.user_id),
+                "login_lookup": lambda r=auth_repo: r.get_user_by_username(user.username),
+                "employee_by_id": lambda r=employee_repo: r.find_by_id(employee.employee_id),
+                "employee_list": lambda r=employee_repo: r.find_all(list_query),
+                "employee_search": lambda r=employee_repo: r.find_all(search_query),
+                "departments": lambda r=employee_repo: r.get_departments(),
+            }
+            for case, call in cases.items():
+                results.setdefault(case, {})[name] = await measure(call, iterations, warmup)
+        return results
+    finally:
+        await asyncpg_pool.disconnect_pg()
+        await disconnect_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prisma vs asyncpg read path latency")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.warmup))
+
+    print(f"{'case':<18} {'impl':<8} {'p50 ms':>9} {'p99 ms':>9}")
+    for case, by_impl in results.items():
+        for impl, stats in by_impl.items():
+            print(f"{case:<18} {impl:<8} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
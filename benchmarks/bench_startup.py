@@ -0,0 +1,130 @@
+# Ukur waktu boot worker: total `python -X importtime` untuk app.main dan
+# time-to-first-request (liveness + readiness) dari proses uvicorn baru.
+#
+#   python -m benchmarks.bench_startup --runs 5 --json startup.json
+#
+# Time-to-first-request butuh DATABASE_URL yang bisa dikoneksi (lifespan connect ke DB).
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_importtime(stderr: str) -> Tuple[int, List[Tuple[str, int]]]:
+    # Format baris: "import time:      self [us] |  cumulative | imported package"
+    total_us = 0
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        # Modul level teratas cuma diawali satu spasi, child diindentasi lebih dalam
+        if not raw_name.startswith("  "):
+            top_level.append((raw_name.strip(), int(cumulative_us)))
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return total_us, top_level
+
+
+def measure_import(module: str) -> Dict:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+
+    total_us, top_level = parse_importtime(result.stderr)
+    return {
+        "process_wall_ms": round(wall_ms, 1),
+        "import_total_ms": round(total_us / 1000, 1),
+        "top_imports_ms": {name: round(us / 1000, 1) for name, us in top_level[:15]},
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, deadline: float) -> Optional[float]:
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def measure_first_request(timeout: float) -> Dict:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        deadline = start + timeout
+        live_at = wait_for(f"http://127.0.0.1:{port}/health", deadline)
+        ready_at = wait_for(f"http://127.0.0.1:{port}/health/ready", deadline)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    return {
+        "first_request_ms": round((live_at - start) * 1000, 1) if live_at else None,
+        "ready_ms": round((ready_at - start) * 1000, 1) if ready_at else None,
+    }
+
+
+def summarize(samples: List[Dict], key: str) -> Optional[float]:
+    values = [sample[key] for sample in samples if sample.get(key) is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker boot time benchmark")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--skip-server", action="store_true", help="Only measure import time")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON")
+    args = parser.parse_args()
+
+    imports = [measure_import(args.module) for _ in range(args.runs)]
+    result = {
+        "module": args.module,
+        "runs": args.runs,
+        "import_total_ms": summarize(imports, "import_total_ms"),
+        "process_wall_ms": summarize(imports, "process_wall_ms"),
+        "top_imports_ms": imports[-1]["top_imports_ms"],
+    }
+
+    if not args.skip_server:
+        servers = [measure_first_request(args.timeout) for _ in range(args.runs)]
+        result["first_request_ms"] = summarize(servers, "first_request_ms")
+        result["ready_ms"] = summarize(servers, "ready_ms")
+
+    print(json.dumps(result, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
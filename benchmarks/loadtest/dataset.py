@@ -0,0 +1,20 @@
+# Konstanta dan penamaan data load test, dipakai bersama seed.py dan driver.py.
+# Penamaan yang juga dipakai backend in-memory ada di app.internal.util.synthetic_data
+# (modul murni, tanpa import app/prisma), driver tetap bisa jalan tanpa koneksi DB.
+from app.internal.util.synthetic_data import (  # noqa: F401
+    DEPARTMENTS,
+    FIRST_NAMES,
+    HRD_USERNAME,
+    LAST_NAMES,
+    NAMESPACE,
+    email_for,
+    employee_id,
+    employee_username,
+    stable_id,
+)
+
+# Sama dengan default MEMORY_SEED_PASSWORD
+DEFAULT_PASSWORD = "loadtest123"
+ADMIN_USERNAME = "lt_admin"
+
+BANKS = ["BCA", "BRI", "BNI", "Mandiri", "CIMB Niaga"]
@@ -0,0 +1,232 @@
+# Load driver async: replay campuran request realistis ke app yang sedang jalan
+# dan laporkan throughput + p50/p95/p99 per endpoint sebagai JSON.
+#
+#   python -m app serve --workers 4 &
+#   python -m benchmarks.loadtest.driver --base-url http://127.0.0.1:8000 \
+#       --duration 60 --concurrency 64 --users 1000 --json loadtest.json
+#
+# Data harus di-seed dulu dengan benchmarks.loadtest.seed (--users di sini
+# tidak boleh lebih besar dari --users saat seeding).
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.loadtest.dataset import (
+    DEFAULT_PASSWORD,
+    DEPARTMENTS,
+    FIRST_NAMES,
+    HRD_USERNAME,
+    employee_username,
+)
+
+# Bobot mengikuti pola trafik harian: list/search HR paling sering, login
+# (bcrypt) jarang tapi mahal
+DEFAULT_MIX = {
+    "login": 5,
+    "list": 30,
+    "search": 20,
+    "profile": 30,
+    "stats": 10,
+    "departments": 5,
+}
+
+
+def parse_mix(raw: Optional[str]) -> Dict[str, int]:
+    if not raw:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in raw.split(","):
+        name, weight = part.split("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown endpoint in mix: {name} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight)
+    return mix
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, elapsed: float, status: Optional[int]) -> None:
+        self.latencies[endpoint].append(elapsed * 1000)
+        self.statuses[endpoint][str(status) if status else "error"] += 1
+        if status is None or status >= 400:
+            self.errors[endpoint] += 1
+
+    def summary(self, duration: float) -> Dict:
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": self.errors[endpoint],
+                "rps": round(len(samples) / duration, 2),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+                "mean_ms": round(statistics.fmean(samples), 2),
+                "status": dict(self.statuses[endpoint]),
+            }
+        total = sum(item["requests"] for item in endpoints.values())
+        return {
+            "total_requests": total,
+            "total_errors": sum(self.errors.values()),
+            "rps": round(total / duration, 2),
+            "endpoints": endpoints,
+        }
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> Tuple[Optional[str], Optional[int]]:
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    if response.status_code != 200:
+        return None, response.status_code
+    return response.json()["data"]["access_token"], response.status_code
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, args, rng: random.Random, hrd_token: str):
+        self.client = client
+        self.args = args
+        self.rng = rng
+        self.hrd_headers = {"Authorization": f"Bearer {hrd_token}"}
+        self.employee_headers: Optional[Dict[str, str]] = None
+        self.username = employee_username(rng.randrange(args.users))
+
+    def request_for(self, endpoint: str):
+        if endpoint == "list":
+            params = {
+                "page": self.rng.randint(1, self.args.max_page),
+                "limit": 20,
+                "sort_by": self.rng.choice(["full_name", "hire_date", "employee_code"]),
+            }
+            if self.rng.random() < 0.3:
+                params["department"] = self.rng.choice(list(DEPARTMENTS))
+            return self.client.get("/api/employee", params=params, headers=self.hrd_headers)
+        if endpoint == "search":
+            params = {"q": self.rng.choice(FIRST_NAMES), "limit": 10}
+            return self.client.get("/api/employee/search", params=params, headers=self.hrd_headers)
+        if endpoint == "stats":
+            return self.client.get("/api/employee/statistics", headers=self.hrd_headers)
+        if endpoint == "departments":
+            return self.client.get("/api/employee/departments", headers=self.hrd_headers)
+        if endpoint == "profile":
+            return self.client.get("/api/employee/me", headers=self.employee_headers)
+        raise ValueError(endpoint)
+
+    async def step(self, endpoint: str, recorder: Recorder) -> None:
+        start = time.perf_counter()
+        status = None
+        try:
+            if endpoint == "login" or (endpoint == "profile" and self.employee_headers is None):
+                token, status = await login(self.client, self.username, self.args.password)
+                if token:
+                    self.employee_headers = {"Authorization": f"Bearer {token}"}
+                endpoint = "login"
+            else:
+                response = await self.request_for(endpoint)
+                status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        recorder.record(endpoint, time.perf_counter() - start, status)
+
+
+async def run_user(user: VirtualUser, mix: Dict[str, int], deadline: float, recorder: Recorder) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        await user.step(user.rng.choices(names, weights)[0], recorder)
+        if user.args.think_time:
+            await asyncio.sleep(user.rng.expovariate(1 / user.args.think_time))
+
+
+async def run(args) -> Dict:
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        hrd_token, status = await login(client, args.hrd_username, args.password)
+        if not hrd_token:
+            raise SystemExit(f"Login as {args.hrd_username} failed ({status}), seed the database first")
+
+        rng = random.Random(args.seed)
+        users = [
+            VirtualUser(client, args, random.Random(rng.getrandbits(64)), hrd_token)
+            for _ in range(args.concurrency)
+        ]
+
+        if args.warmup:
+            warmup_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(run_user(user, mix, warmup_deadline, Recorder()) for user in users))
+
+        recorder = Recorder()
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(run_user(user, mix, deadline, recorder) for user in users))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "commit": git_commit(),
+        "base_url": args.base_url,
+        "duration_s": round(elapsed, 2),
+        "concurrency": args.concurrency,
+        "mix": mix,
+        **recorder.summary(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a realistic request mix and report latency percentiles")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=32, help="Virtual users")
+    parser.add_argument("--users", type=int, default=100, help="Seeded employee accounts to log in as")
+    parser.add_argument("--hrd-username", default=HRD_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--mix", help="Weights, e.g. login=5,list=30,search=20,profile=30,stats=10,departments=5")
+    parser.add_argument("--max-page", type=int, default=50, help="Highest page requested by list calls")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between requests in seconds")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    print(f"{'endpoint':<12} {'req':>8} {'err':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, stats in result["endpoints"].items():
+        print(
+            f"{endpoint:<12} {stats['requests']:>8} {stats['errors']:>6} {stats['rps']:>9.1f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+    print(f"total: {result['total_requests']} requests, {result['rps']} req/s, {result['total_errors']} errors")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
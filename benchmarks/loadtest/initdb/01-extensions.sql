@@ -0,0 +1,2 @@
+-- Schema memakai uuid_generate_v4() sebagai default primary key
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
@@ -0,0 +1,2 @@
+-- AlterTable
+ALTER TABLE "employees" ADD COLUMN "photo_variants" JSONB;
@@ -0,0 +1,15 @@
+-- AlterTable
+ALTER TABLE "employees" ADD COLUMN "photo_digest" VARCHAR(64);
+
+-- CreateTable
+CREATE TABLE "photo_assets" (
+    "digest" VARCHAR(64) NOT NULL,
+    "url" VARCHAR(255) NOT NULL,
+    "variants" JSONB,
+    "created_at" TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "photo_assets_pkey" PRIMARY KEY ("digest")
+);
+
+-- CreateIndex
+CREATE INDEX "idx_employees_photo_digest" ON "employees"("photo_digest");
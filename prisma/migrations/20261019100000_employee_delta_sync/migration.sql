@@ -0,0 +1,16 @@
+-- Backfill: delta sync hanya melihat baris dengan updated_at
+UPDATE "employees" SET "updated_at" = COALESCE("created_at", CURRENT_TIMESTAMP) WHERE "updated_at" IS NULL;
+
+-- CreateTable
+CREATE TABLE "employee_tombstones" (
+    "employee_id" UUID NOT NULL,
+    "deleted_at" TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "employee_tombstones_pkey" PRIMARY KEY ("employee_id")
+);
+
+-- CreateIndex
+CREATE INDEX "idx_employees_updated_at" ON "employees"("updated_at", "employee_id");
+
+-- CreateIndex
+CREATE INDEX "idx_employee_tombstones_deleted_at" ON "employee_tombstones"("deleted_at", "employee_id");
@@ -0,0 +1,79 @@
+import asyncio
+import httpx
+import pytest
+from starlette.responses import PlainTextResponse
+from app.internal.middleware import admission_middleware
+from app.internal.middleware.admission_middleware import AdmissionControlMiddleware, PriorityClass
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_priority_class_queues_then_sheds():
+    bulkhead = PriorityClass("heavy", limit=1, queue_size=1)
+
+    assert await bulkhead.acquire(timeout=1) is None
+    waiting = asyncio.ensure_future(bulkhead.acquire(timeout=1))
+    await asyncio.sleep(0)
+    assert len(bulkhead.waiters) == 1
+    assert await bulkhead.acquire(timeout=1) == "queue_full"
+
+    # Slot diserahkan langsung ke waiter, active tetap 1
+    bulkhead.release()
+    assert await waiting is None
+    assert bulkhead.active == 1
+
+    bulkhead.release()
+    assert bulkhead.active == 0
+
+
+async def test_priority_class_times_out_waiters():
+    bulkhead = PriorityClass("heavy", limit=1, queue_size=1)
+    await bulkhead.acquire(timeout=1)
+
+    assert await bulkhead.acquire(timeout=0.01) == "timeout"
+    assert not bulkhead.waiters
+    bulkhead.release()
+    assert bulkhead.active == 0
+
+
+@pytest.fixture
+def admission_settings(monkeypatch):
+    settings = admission_middleware.settings
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMISSION_LIMITS", {"heavy": 1})
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZES", {"heavy": 1})
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT_SECONDS", 5.0)
+    monkeypatch.setattr(settings, "ADMISSION_RETRY_AFTER_SECONDS", 3)
+
+
+async def test_overloaded_class_is_shed_with_503(admission_settings):
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            started.set()
+            await release.wait()
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    middleware = AdmissionControlMiddleware(app, route_classes={"/slow": "heavy", "/health": "internal"})
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        running = asyncio.ensure_future(client.get("/slow"))
+        await started.wait()
+        queued = asyncio.ensure_future(client.get("/slow"))
+        while not middleware.classes["heavy"].waiters:
+            await asyncio.sleep(0)
+
+        shed = await client.get("/slow")
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "3"
+        assert shed.json()["error"] == "admission_queue_full"
+
+        # Kelas lain (tanpa limit) tetap dilayani selama "heavy" penuh
+        assert (await client.get("/health")).status_code == 200
+
+        release.set()
+        assert (await running).status_code == 200
+        assert (await queued).status_code == 200
+    assert middleware.classes["heavy"].active == 0
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+import pytest
+from app.internal.connection import instrumentation
+from app.internal.connection.instrumentation import InstrumentedPrisma
+from app.internal.repository.memory_repo import InMemoryEmployeeRepository
+from app.internal.util import deadline
+from app.internal.util.deadline import DeadlineExceeded
+from app.internal.util.request_context import RequestContext, reset_request_context, set_request_context
+from app.internal.util.route_rules import RouteRules
+
+
+class EmployeesActions:
+    # Bentuk minimal delegate model Prisma, cukup untuk InstrumentedPrisma
+    def __init__(self, log, delay=0.0, error=None):
+        self.log = log
+        self.delay = delay
+        self.error = error
+
+    async def find_many(self, **kwargs):
+        self.log.append(("find_many", kwargs))
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return ["row"]
+
+    async def create(self, **kwargs):
+        self.log.append(("create", kwargs))
+        await asyncio.sleep(self.delay)
+        return "created"
+
+
+class FakePrisma:
+    def __init__(self, delay=0.0, error=None):
+        self.log = []
+        self.employees = EmployeesActions(self.log, delay, error)
+
+    async def execute_raw(self, query, *args):
+        self.log.append(("execute_raw", (query, *args)))
+        return 0
+
+    @asynccontextmanager
+    async def tx(self, max_wait=None, timeout=None):
+        self.log.append(("tx", timeout))
+        yield self
+
+
+@contextmanager
+def deadline_in(seconds: float):
+    token = set_request_context(RequestContext(deadline=time.perf_counter() + seconds))
+    try:
+        yield
+    finally:
+        reset_request_context(token)
+
+
+@pytest.mark.anyio
+async def test_read_runs_with_local_statement_timeout(monkeypatch):
+    monkeypatch.setattr(instrumentation.settings, "DB_SCOPED_STATEMENT_TIMEOUT", True)
+    client = FakePrisma()
+
+    with deadline_in(2.0):
+        assert await InstrumentedPrisma(client).employees.find_many(where={"is_active": True}) == ["row"]
+
+    actions = [entry[0] for entry in client.log]
+    assert actions == ["tx", "execute_raw", "find_many"]
+    query, timeout_ms = client.log[1][1]
+    assert "set_config('statement_timeout', $1, true)" in query
+    assert 1000 < int(timeout_ms) <= 2000
+
+
+@pytest.mark.anyio
+async def test_writes_and_unbounded_reads_skip_the_transaction(monkeypatch):
+    monkeypatch.setattr(instrumentation.settings, "DB_SCOPED_STATEMENT_TIMEOUT", True)
+    client = FakePrisma()
+    instrumented = InstrumentedPrisma(client)
+
+    await instrumented.employees.find_many()
+    with deadline_in(2.0):
+        await instrumented.employees.create(data={})
+
+    assert [entry[0] for entry in client.log] == ["find_many", "create"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("scoped", [True, False])
+async def test_slow_read_past_deadline_raises_504(monkeypatch, scoped):
+    monkeypatch.setattr(instrumentation.settings, "DB_SCOPED_STATEMENT_TIMEOUT", scoped)
+    monkeypatch.setattr(instrumentation, "SCOPED_TX_GRACE_SECONDS", 0.01)
+
+    with deadline_in(0.02), pytest.raises(DeadlineExceeded) as error:
+        await InstrumentedPrisma(FakePrisma(delay=1.0)).employees.find_many()
+    assert error.value.status_code == 504
+
+
+@pytest.mark.anyio
+async def test_server_statement_timeout_maps_to_504(monkeypatch):
+    monkeypatch.setattr(instrumentation.settings, "DB_SCOPED_STATEMENT_TIMEOUT", True)
+    client = FakePrisma(delay=0.05, error=RuntimeError("canceling statement due to statement timeout"))
+
+    with deadline_in(0.02), pytest.raises(DeadlineExceeded):
+        await InstrumentedPrisma(client).employees.find_many()
+
+
+@pytest.mark.anyio
+async def test_errors_before_the_deadline_are_not_rewritten(monkeypatch):
+    monkeypatch.setattr(instrumentation.settings, "DB_SCOPED_STATEMENT_TIMEOUT", True)
+    client = FakePrisma(error=RuntimeError("relation does not exist"))
+
+    with deadline_in(5.0), pytest.raises(RuntimeError):
+        await InstrumentedPrisma(client).employees.find_many()
+
+
+def test_request_past_its_deadline_gets_504(client, hrd_headers, monkeypatch):
+    async def slow_find_many_by_ids(self, employee_ids, fields=None):
+        await asyncio.sleep(0.05)
+        deadline.remaining_time()
+        return []
+
+    monkeypatch.setattr(deadline, "route_deadlines", RouteRules({"/api/employee/": 10.0}))
+    monkeypatch.setattr(InMemoryEmployeeRepository, "find_many_by_ids", slow_find_many_by_ids)
+
+    response = client.get("/api/employee/00000000-0000-0000-0000-000000000001", headers=hrd_headers)
+
+    assert response.status_code == 504
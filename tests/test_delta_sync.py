@@ -0,0 +1,73 @@
+import pytest
+from app.internal.config.settings import settings
+from app.internal.util.synthetic_data import employee_id
+
+
+@pytest.fixture(autouse=True)
+def no_safety_lag(monkeypatch):
+    # Perubahan langsung terlihat di sync berikutnya
+    monkeypatch.setattr(settings, "DELTA_SYNC_SAFETY_LAG_SECONDS", 0.0)
+
+
+def sync(client, headers, since=None, limit=500):
+    params = {"limit": limit}
+    if since is not None:
+        params["since"] = since
+    response = client.get("/api/employee/changes", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def sync_all(client, headers, since=None, limit=500):
+    changes, deleted = [], []
+    while True:
+        page = sync(client, headers, since, limit)
+        changes.extend(item["employee_id"] for item in page["changes"])
+        deleted.extend(item["employee_id"] for item in page["deleted"])
+        since = page["next_token"]
+        if not page["has_more"]:
+            return changes, deleted, since
+
+
+def test_initial_sync_pages_through_every_employee(client, hrd_headers):
+    # Semua employee seed punya updated_at sama: halaman dipotong lewat id di watermark
+    changes, deleted, _ = sync_all(client, hrd_headers, limit=7)
+
+    assert len(changes) == settings.MEMORY_SEED_EMPLOYEES
+    assert len(set(changes)) == len(changes)
+    assert deleted == []
+
+
+def test_next_sync_returns_only_changes_since_token(client, hrd_headers):
+    _, _, token = sync_all(client, hrd_headers)
+    assert sync(client, hrd_headers, token)["changes"] == []
+
+    updated = client.patch(f"/api/employee/{employee_id(1)}", data={"position": "Tax Specialist"}, headers=hrd_headers)
+    assert updated.status_code == 200, updated.text
+    deactivated = client.delete(f"/api/employee/{employee_id(2)}", headers=hrd_headers)
+    assert deactivated.status_code == 200, deactivated.text
+
+    changes, deleted, token = sync_all(client, hrd_headers, token)
+
+    assert sorted(changes) == sorted([employee_id(1), employee_id(2)])
+    assert deleted == []
+    assert sync(client, hrd_headers, token)["changes"] == []
+
+
+def test_hard_delete_is_reported_as_tombstone(client, hrd_headers):
+    _, _, token = sync_all(client, hrd_headers)
+
+    response = client.delete(f"/api/employee/{employee_id(3)}", params={"hard_delete": True}, headers=hrd_headers)
+    assert response.status_code == 200, response.text
+
+    changes, deleted, token = sync_all(client, hrd_headers, token)
+    assert changes == []
+    assert deleted == [employee_id(3)]
+
+    # Tombstone tidak dikirim ulang
+    assert sync(client, hrd_headers, token)["deleted"] == []
+
+
+def test_invalid_token_is_rejected(client, hrd_headers):
+    response = client.get("/api/employee/changes", params={"since": "not-a-token"}, headers=hrd_headers)
+    assert response.status_code == 400
@@ -0,0 +1,44 @@
+import pytest
+from app.internal.repository.employee_repo import projected_columns
+from app.internal.util.synthetic_data import employee_id
+
+MISSING_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def test_batch_keeps_request_order_and_reports_missing(client, hrd_headers):
+    ids = [employee_id(2), MISSING_ID, employee_id(0)]
+    response = client.post("/api/employee/batch", json={"ids": ids}, headers=hrd_headers)
+
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert [item["employee_id"] for item in data["data"]] == [employee_id(2), employee_id(0)]
+    assert data["missing"] == [MISSING_ID]
+
+
+def test_batch_projects_requested_fields(client, hrd_headers):
+    response = client.post(
+        "/api/employee/batch",
+        json={"ids": [employee_id(0)], "fields": ["full_name", "department"]},
+        headers=hrd_headers,
+    )
+
+    assert response.status_code == 200, response.text
+    (item,) = response.json()["data"]["data"]
+    assert set(item) == {"employee_id", "full_name", "department"}
+
+
+def test_batch_rejects_unknown_fields(client, hrd_headers):
+    response = client.post(
+        "/api/employee/batch",
+        json={"ids": [employee_id(0)], "fields": ["password"]},
+        headers=hrd_headers,
+    )
+
+    assert response.status_code == 422
+
+
+def test_projected_columns_follow_the_whitelist():
+    # Nama kolom masuk ke SQL proyeksi Prisma/asyncpg
+    assert projected_columns(["department", "full_name"]) == ["employee_id", "full_name", "department"]
+    with pytest.raises(ValueError):
+        projected_columns(["full_name; DROP TABLE employees"])
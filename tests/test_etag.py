@@ -0,0 +1,59 @@
+from app.internal.util.synthetic_data import employee_id
+
+
+def test_employee_read_answers_304_for_matching_etag(client, hrd_headers):
+    path = f"/api/employee/{employee_id(0)}"
+    first = client.get(path, headers=hrd_headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    cached = client.get(path, headers={**hrd_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    # Perbandingan lemah: bentuk strong dan daftar kandidat juga cocok
+    strong = etag[2:]
+    assert client.get(path, headers={**hrd_headers, "If-None-Match": strong}).status_code == 304
+    assert client.get(path, headers={**hrd_headers, "If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get(path, headers={**hrd_headers, "If-None-Match": "*"}).status_code == 304
+
+
+def test_update_changes_employee_etag(client, hrd_headers):
+    path = f"/api/employee/{employee_id(0)}"
+    etag = client.get(path, headers=hrd_headers).headers["ETag"]
+
+    updated = client.patch(path, data={"position": "QA Engineer"}, headers=hrd_headers)
+    assert updated.status_code == 200, updated.text
+
+    response = client.get(path, headers={**hrd_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"]["position"] == "QA Engineer"
+
+
+def test_list_etag_follows_collection_version(client, hrd_headers):
+    params = {"page": 1, "limit": 5}
+    first = client.get("/api/employee", params=params, headers=hrd_headers)
+    assert first.status_code == 200, first.text
+    etag = first.headers["ETag"]
+
+    assert client.get("/api/employee", params=params, headers={**hrd_headers, "If-None-Match": etag}).status_code == 304
+    # Query lain, ETag lain
+    other = client.get("/api/employee", params={"page": 2, "limit": 5}, headers={**hrd_headers, "If-None-Match": etag})
+    assert other.status_code == 200
+
+    # Write ke employee mana pun mengganti versi koleksi
+    updated = client.patch(f"/api/employee/{employee_id(4)}", data={"department": "Finance"}, headers=hrd_headers)
+    assert updated.status_code == 200, updated.text
+    refreshed = client.get("/api/employee", params=params, headers={**hrd_headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+
+
+def test_reference_data_etag(client, hrd_headers):
+    for path in ("/api/employee/departments", "/api/employee/statistics"):
+        etag = client.get(path, headers=hrd_headers).headers["ETag"]
+        assert client.get(path, headers={**hrd_headers, "If-None-Match": etag}).status_code == 304
@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import pytest
+from app.internal.util import metrics
+from app.internal.util.metrics import Registry, load_snapshots, merge_snapshots, render, write_snapshot
+
+
+def worker_registry():
+    registry = Registry()
+    return (
+        registry,
+        registry.counter("test_requests_total", "Requests", ["route"]),
+        registry.gauge("test_in_progress", "In progress"),
+        registry.histogram("test_duration_seconds", "Duration", buckets=(0.1, 1.0)),
+    )
+
+
+def run_worker(directory: str) -> None:
+    # Worker prefork: state metric sendiri, snapshot ke direktori bersama
+    registry, requests, in_progress, duration = worker_registry()
+    requests.inc(2, route="/a")
+    in_progress.set(3)
+    duration.observe(0.5)
+    write_snapshot(registry.snapshot(), directory)
+
+
+def test_snapshots_from_forked_workers_are_merged(tmp_path):
+    directory = str(tmp_path)
+    worker = multiprocessing.get_context("fork").Process(target=run_worker, args=(directory,))
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+
+    registry, requests, in_progress, duration = worker_registry()
+    requests.inc(route="/a")
+    requests.inc(route="/b")
+    in_progress.set(1)
+    duration.observe(0.05)
+    write_snapshot(registry.snapshot(), directory)
+
+    snapshots = load_snapshots(directory=directory)
+    assert sorted(snapshot["pid"] for snapshot in snapshots) == sorted([worker.pid, os.getpid()])
+    merged = merge_snapshots(snapshots)
+
+    # Counter dan histogram dijumlah, termasuk dari worker yang sudah keluar
+    assert merged["test_requests_total"]["values"] == {("/a",): 3.0, ("/b",): 1.0}
+    *buckets, total = merged["test_duration_seconds"]["values"][()]
+    assert buckets == [1, 1, 0]
+    assert total == pytest.approx(0.55)
+    # Gauge worker yang sudah mati tidak ikut
+    assert merged["test_in_progress"]["values"] == {(): 1.0}
+
+    text = render(merged)
+    assert 'test_requests_total{route="/a"} 3' in text
+    assert 'test_duration_seconds_bucket{le="1"} 2' in text
+    assert "test_duration_seconds_count 2" in text
+
+
+def test_render_latest_includes_own_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    registry, requests, _, _ = worker_registry()
+    requests.inc(route="/a")
+
+    text = metrics.render_latest(registry.snapshot())
+
+    assert os.path.exists(tmp_path / f"metrics_{os.getpid()}.json")
+    assert 'test_requests_total{route="/a"} 1' in text
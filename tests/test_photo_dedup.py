@@ -0,0 +1,104 @@
+import asyncio
+import io
+import pytest
+from starlette.datastructures import Headers, UploadFile
+from app.dto.employee_dto import UpdateEmployeeDto
+from app.internal.repository.memory_repo import InMemoryEmployeeRepository, InMemoryStore, populate
+from app.internal.service.cloudinary_service import CloudinaryService
+from app.internal.service.employee_service import EmployeeService
+from app.internal.util.synthetic_data import employee_id
+
+pytestmark = pytest.mark.anyio
+
+PHOTO = b"\x89PNG\r\n\x1a\n" + b"photo-a" * 64
+OTHER_PHOTO = b"\x89PNG\r\n\x1a\n" + b"photo-b" * 64
+
+
+class RecordingCloudinary(CloudinaryService):
+    # Hanya I/O ke Cloudinary yang diganti; read_photo dan public_id asli
+    def __init__(self, upload_delay: float = 0.0):
+        super().__init__()
+        self.upload_delay = upload_delay
+        self.uploaded = []
+        self.deleted = []
+
+    async def upload_photo_content(self, content, public_id):
+        await asyncio.sleep(self.upload_delay)
+        url = f"https://res.cloudinary.com/demo/image/upload/v1/{public_id}.webp"
+        self.uploaded.append(url)
+        return {"url": url, "public_id": public_id, "variants": None}
+
+    async def delete_photo_urls(self, urls):
+        self.deleted.extend(urls)
+
+
+def photo_upload(content: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(content), size=len(content), headers=Headers({"content-type": "image/png"}))
+
+
+@pytest.fixture
+def store():
+    store = InMemoryStore()
+    populate(store, 3, "not-a-real-hash")
+    return store
+
+
+def make_service(store, cloudinary):
+    return EmployeeService(InMemoryEmployeeRepository(store), cloudinary)
+
+
+async def test_identical_photo_is_uploaded_once(store):
+    cloudinary = RecordingCloudinary()
+
+    first = await make_service(store, cloudinary).update_employee(employee_id(0), UpdateEmployeeDto(), photo_upload(PHOTO))
+    second = await make_service(store, cloudinary).update_employee(employee_id(1), UpdateEmployeeDto(), photo_upload(PHOTO))
+
+    assert first["photo_info"]["uploaded"] is True
+    assert second["photo_info"]["uploaded"] is False
+    assert second["photo_url"] == first["photo_url"]
+    assert cloudinary.uploaded == [first["photo_url"]]
+    assert len(store.photo_assets) == 1
+
+
+async def test_concurrent_identical_uploads_keep_one_asset(store):
+    # Dua request lolos cek awal bersamaan: yang kalah klaim membuang hasil uploadnya
+    cloudinary = RecordingCloudinary(upload_delay=0.01)
+
+    first, second = await asyncio.gather(
+        make_service(store, cloudinary).update_employee(employee_id(0), UpdateEmployeeDto(), photo_upload(PHOTO)),
+        make_service(store, cloudinary).update_employee(employee_id(1), UpdateEmployeeDto(), photo_upload(PHOTO)),
+    )
+
+    assert first["photo_url"] == second["photo_url"]
+    (asset,) = store.photo_assets.values()
+    assert asset.url == first["photo_url"]
+    assert len(cloudinary.uploaded) == 2
+    assert set(cloudinary.uploaded) - set(cloudinary.deleted) == {asset.url}
+
+
+async def test_shared_photo_is_kept_until_last_reference_is_gone(store):
+    cloudinary = RecordingCloudinary()
+    for index in (0, 1):
+        await make_service(store, cloudinary).update_employee(employee_id(index), UpdateEmployeeDto(), photo_upload(PHOTO))
+    shared_url = store.employees[employee_id(0)].photo_url
+
+    await make_service(store, cloudinary).update_employee(employee_id(0), UpdateEmployeeDto(), photo_upload(OTHER_PHOTO))
+    assert shared_url not in cloudinary.deleted
+    assert len(store.photo_assets) == 2
+
+    await make_service(store, cloudinary).update_employee(employee_id(1), UpdateEmployeeDto(), photo_upload(OTHER_PHOTO))
+    assert shared_url in cloudinary.deleted
+    assert [asset.url for asset in store.photo_assets.values()] == [store.employees[employee_id(1)].photo_url]
+
+
+async def test_resending_current_photo_changes_nothing(store):
+    cloudinary = RecordingCloudinary()
+    service = make_service(store, cloudinary)
+    await service.update_employee(employee_id(0), UpdateEmployeeDto(), photo_upload(PHOTO))
+    updated_at = store.employees[employee_id(0)].updated_at
+
+    result = await make_service(store, cloudinary).update_employee(employee_id(0), UpdateEmployeeDto(), photo_upload(PHOTO))
+
+    assert result["photo_info"]["uploaded"] is False
+    assert store.employees[employee_id(0)].updated_at == updated_at
+    assert len(cloudinary.uploaded) == 1
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from app.internal.repository.memory_repo import InMemoryEmployeeRepository, InMemoryStore, populate
+from app.internal.service.employee_service import EmployeeService
+from app.internal.util.cache import shared_cache
+from app.internal.util.singleflight import SingleFlight
+from app.internal.util.synthetic_data import employee_id
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingRepository(InMemoryEmployeeRepository):
+    calls = 0
+
+    async def find_many_by_ids(self, employee_ids, fields=None):
+        CountingRepository.calls += 1
+        await asyncio.sleep(0.01)
+        return await super().find_many_by_ids(employee_ids, fields)
+
+
+async def test_concurrent_calls_share_one_execution():
+    group = SingleFlight("test")
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    results = await asyncio.gather(*(group.do("key", load) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert group.in_flight() == 0
+
+
+async def test_different_keys_run_separately():
+    group = SingleFlight("test")
+    seen = []
+
+    async def load(key):
+        seen.append(key)
+        await asyncio.sleep(0)
+        return key
+
+    assert await asyncio.gather(group.do("a", lambda: load("a")), group.do("b", lambda: load("b"))) == ["a", "b"]
+    assert sorted(seen) == ["a", "b"]
+
+
+async def test_error_reaches_every_caller_and_is_not_kept():
+    group = SingleFlight("test")
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(group.do("key", fail), group.do("key", fail), return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # Key dilepas setelah selesai: panggilan berikutnya mencoba lagi
+    with pytest.raises(RuntimeError):
+        await group.do("key", fail)
+    assert calls == 2
+
+
+async def test_cancelled_caller_does_not_cancel_the_others():
+    group = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "done"
+
+    leader = asyncio.ensure_future(group.do("key", load))
+    follower = asyncio.ensure_future(group.do("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_concurrent_employee_reads_hit_the_repository_once():
+    store = InMemoryStore()
+    populate(store, 1, "not-a-real-hash")
+    await shared_cache.clear_local()
+    CountingRepository.calls = 0
+
+    results = await asyncio.gather(*(
+        EmployeeService(CountingRepository(store)).get_employee_by_id(employee_id(0)) for _ in range(20)
+    ))
+
+    assert CountingRepository.calls == 1
+    assert {result.employee_id for result in results} == {employee_id(0)}
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from app.internal.util import cache
+from app.internal.util.cache import (
+    REVALIDATION_FAILED_WARNING,
+    STALE_WARNING,
+    LocalBackend,
+    LRUCache,
+    TwoTierCache,
+)
+from app.internal.util.request_context import RequestContext, reset_request_context, set_request_context
+
+pytestmark = pytest.mark.anyio
+
+
+class Loader:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+@pytest.fixture
+def swr_cache():
+    return TwoTierCache(LRUCache(max_entries=100, ttl=60), LocalBackend(), name="test")
+
+
+@pytest.fixture
+def request_context():
+    context = RequestContext()
+    token = set_request_context(context)
+    yield context
+    reset_request_context(token)
+
+
+async def settle(swr_cache):
+    # Tunggu refresh background selesai
+    while swr_cache._refreshing:
+        await asyncio.gather(*swr_cache._refreshing.values(), return_exceptions=True)
+
+
+async def test_fresh_entry_is_served_without_loading(swr_cache):
+    loader = Loader("v1")
+
+    assert await swr_cache.get_or_load("key", loader, ttl=60) == "v1"
+    assert await swr_cache.get_or_load("key", loader, ttl=60) == "v1"
+    assert loader.calls == 1
+
+
+async def test_stale_entry_is_served_while_one_refresh_runs(swr_cache, request_context):
+    loader = Loader("v1", "v2")
+    # ttl 0: langsung basi, tapi masih dalam CACHE_MAX_STALE_SECONDS
+    await swr_cache.get_or_load("key", loader, ttl=0)
+
+    stale = await asyncio.gather(*(swr_cache.get_or_load("key", loader, ttl=0) for _ in range(5)))
+
+    assert stale == ["v1"] * 5
+    assert request_context.warnings == [STALE_WARNING]
+    await settle(swr_cache)
+    assert loader.calls == 2
+    assert (await swr_cache.get("key"))["value"] == "v2"
+
+
+async def test_failed_refresh_keeps_serving_stale_value(swr_cache, request_context):
+    loader = Loader("v1", RuntimeError("db down"), "v2")
+    await swr_cache.get_or_load("key", loader, ttl=0)
+
+    assert await swr_cache.get_or_load("key", loader, ttl=0) == "v1"
+    await settle(swr_cache)
+
+    # Refresh gagal: tetap v1, kali ini dengan Warning 111
+    request_context.warnings.clear()
+    assert await swr_cache.get_or_load("key", loader, ttl=0) == "v1"
+    assert request_context.warnings == [REVALIDATION_FAILED_WARNING]
+    await settle(swr_cache)
+    assert (await swr_cache.get("key"))["value"] == "v2"
+
+
+async def test_entry_past_max_staleness_is_reloaded_inline(swr_cache, request_context, monkeypatch):
+    monkeypatch.setattr(cache.settings, "CACHE_MAX_STALE_SECONDS", 0.0)
+    loader = Loader("v1", "v2")
+    await swr_cache.get_or_load("key", loader, ttl=0)
+
+    assert await swr_cache.get_or_load("key", loader, ttl=0) == "v2"
+    assert request_context.warnings == []
+    assert loader.calls == 2
+
+
+async def test_missing_value_is_not_cached(swr_cache):
+    loader = Loader(None, "v1")
+
+    assert await swr_cache.get_or_load("key", loader, ttl=60) is None
+    assert await swr_cache.get_or_load("key", loader, ttl=60) == "v1"
+
+
+@pytest.fixture
+def expired_reference_cache(monkeypatch):
+    # Dipasang sebelum client: warm-up di lifespan juga menyimpan entry yang langsung basi
+    monkeypatch.setattr(cache.settings, "REFERENCE_CACHE_TTL_SECONDS", 0)
+
+
+def test_stale_response_carries_warning_header(expired_reference_cache, client, hrd_headers):
+    first = client.get("/api/employee/departments", headers=hrd_headers)
+    assert first.status_code == 200
+
+    second = client.get("/api/employee/departments", headers=hrd_headers)
+    assert second.status_code == 200
+    assert second.headers["Warning"] == STALE_WARNING
+    assert second.json()["data"] == first.json()["data"]